@@ -0,0 +1,69 @@
+"""Сравнение двух отчетов benchmarks.load
+
+    python -m benchmarks.compare baseline.json candidate.json --max-regression 10
+
+Код возврата 1, если p95 или p99 какой-либо операции выросли больше порога,
+пропускная способность упала больше порога или выросла доля неуспешных ответов.
+"""
+import argparse
+import json
+import sys
+
+METRICS = ("throughput_rps", "p50_ms", "p95_ms", "p99_ms")
+# Для задержек рост — это регресс, для пропускной способности — падение
+HIGHER_IS_BETTER = {"throughput_rps"}
+GATED = ("throughput_rps", "p95_ms", "p99_ms")
+
+
+def change_percent(before: float, after: float) -> float:
+    return (after - before) / before * 100 if before else 0.0
+
+
+def failure_percent(summary: dict) -> float:
+    """Доля ошибок и неожиданных 4xx среди всех ответов операции"""
+    failures = summary["errors"] + summary.get("client_errors", 0)
+    total = summary["count"] + failures
+    return failures / total * 100 if total else 0.0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Сравнение двух отчетов нагрузочного теста")
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument("--max-regression", type=float, default=10.0, help="Допустимый регресс, %%")
+    args = parser.parse_args()
+
+    with open(args.baseline) as file:
+        baseline = json.load(file)
+    with open(args.candidate) as file:
+        candidate = json.load(file)
+
+    regressions = []
+    for router, operations in candidate["routers"].items():
+        print(f"\n{router}")
+        for label, after in operations.items():
+            before = baseline["routers"].get(router, {}).get(label)
+            if before is None:
+                print(f"  {label}: нет в базовом отчете")
+                continue
+            cells = []
+            for metric in METRICS:
+                delta = change_percent(before[metric], after[metric])
+                cells.append(f"{metric} {before[metric]:.2f} -> {after[metric]:.2f} ({delta:+.1f}%)")
+                regress = -delta if metric in HIGHER_IS_BETTER else delta
+                if metric in GATED and regress > args.max_regression:
+                    regressions.append(f"{router} {label} {metric} {delta:+.1f}%")
+            failed_before, failed_after = failure_percent(before), failure_percent(after)
+            cells.append(f"failures {failed_before:.2f}% -> {failed_after:.2f}%")
+            if failed_after > failed_before:
+                regressions.append(f"{router} {label} failures {failed_before:.2f}% -> {failed_after:.2f}%")
+            print(f"  {label}\n    " + "\n    ".join(cells))
+
+    if regressions:
+        print("\nРегрессии:\n  " + "\n  ".join(regressions))
+        sys.exit(1)
+    print("\nРегрессий нет")
+
+
+if __name__ == "__main__":
+    main()
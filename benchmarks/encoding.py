@@ -0,0 +1,96 @@
+"""Сравнение размера и стоимости кодирования ответов: JSON/msgpack × без сжатия/gzip/zstd
+
+Для каждой комбинации измеряется время кодирования и сжатия страницы сотрудников
+целиком (как в списках и батчах) и потоком по частям (как в выгрузке), размер тела
+и оценка времени передачи по каналу заданной ширины. БД не нужна: строки
+генерируются в памяти.
+
+    python -m benchmarks.encoding --rows 10000 --repeat 5 --mbps 100
+"""
+import argparse
+import json
+import statistics
+import time
+from typing import Callable
+
+from src.api.encoding import MSGPACK_AVAILABLE, Negotiated, zstandard
+from src.api.responses import rows_to_dicts
+from src.config import settings
+
+from .serialization import FIELDS, make_rows
+
+
+def whole(encoding: Negotiated, rows: list[tuple]) -> bytes:
+    """Ответ целиком, как у списков, батчей и ленты изменений"""
+    return encoding.response({"items": rows_to_dicts(FIELDS, rows), "next_cursor": None}).body
+
+
+def streamed(encoding: Negotiated, rows: list[tuple]) -> bytes:
+    """Выгрузка частями по export_batch_size строк через потоковый компрессор"""
+    compressor = encoding.compressor() if encoding.compression else None
+    parts = []
+    size = settings.export_batch_size
+    for start in range(0, len(rows), size):
+        chunk = b"".join(encoding.encode(item) for item in rows_to_dicts(FIELDS, rows[start:start + size]))
+        parts.append(compressor.compress(chunk) if compressor else chunk)
+    if compressor:
+        parts.append(compressor.flush())
+    return b"".join(parts)
+
+
+def measure(
+    fn: Callable[[Negotiated, list[tuple]], bytes], encoding: Negotiated, rows: list[tuple], repeat: int, mbps: float
+) -> dict[str, float]:
+    """Медианное время кодирования, размер тела и оценка времени передачи"""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        payload = fn(encoding, rows)
+        timings.append(time.perf_counter() - started)
+    median = statistics.median(timings)
+    transfer = len(payload) * 8 / (mbps * 1_000_000)
+    return {
+        "cpu_ms": median * 1000,
+        "bytes": len(payload),
+        "transfer_ms": transfer * 1000,
+        "total_ms": (median + transfer) * 1000,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--mbps", type=float, default=100.0, help="Ширина канала для оценки времени передачи")
+    parser.add_argument("--output", help="Сохранить результаты в JSON-файл")
+    args = parser.parse_args()
+
+    formats = [False] + ([True] if MSGPACK_AVAILABLE else [])
+    compressions = [None, "gzip"] + (["zstd"] if zstandard is not None else [])
+    rows = make_rows(args.rows)
+
+    results: dict[str, dict] = {"rows": args.rows, "mbps": args.mbps, "whole": {}, "stream": {}}
+    for mode, fn in (("whole", whole), ("stream", streamed)):
+        baseline = None
+        print(f"{mode}:")
+        for use_msgpack in formats:
+            for compression in compressions:
+                encoding = Negotiated(msgpack=use_msgpack, compression=compression)
+                name = f"{'msgpack' if use_msgpack else 'json'}+{compression or 'identity'}"
+                result = measure(fn, encoding, rows, args.repeat, args.mbps)
+                baseline = baseline or result["bytes"]
+                result["ratio"] = baseline / result["bytes"]
+                results[mode][name] = result
+                print(
+                    f"  {name:>16}: {result['bytes']:>10} bytes ({result['ratio']:4.1f}x), "
+                    f"cpu {result['cpu_ms']:8.2f} ms, transfer {result['transfer_ms']:8.2f} ms, "
+                    f"total {result['total_ms']:8.2f} ms"
+                )
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
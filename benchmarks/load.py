@@ -0,0 +1,398 @@
+"""Нагрузочный тест роутеров сервиса с машиночитаемым отчетом
+
+Для каждого роутера (admin, users, employees) и для списков, пакетных запросов
+и выгрузок (lists) запускается отдельный прогон с заданной смесью операций. Для каждой операции считаются пропускная
+способность и задержки p50/p95/p99; результат сохраняется в JSON, который
+можно сравнить с другим прогоном через benchmarks.compare.
+
+Перед каждым прогоном заново наполните БД (python -m benchmarks.seed --reset)
+с теми же --users/--employees и запустите сервис: так прогоны сопоставимы.
+
+    python -m benchmarks.load --url http://localhost:4444 --duration 30 --output run.json
+"""
+import argparse
+import asyncio
+import json
+import math
+import platform
+import random
+import subprocess
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Awaitable, Callable
+
+import httpx
+
+from .seed import TELEGRAM_ID_BASE, employee_record
+
+Operation = Callable[[httpx.AsyncClient, "LoadContext"], Awaitable[httpx.Response]]
+
+
+@dataclass
+class LoadContext:
+    """Общее состояние прогона: размер данных и счетчики для создаваемых записей"""
+    rng: random.Random
+    users: int
+    employees: int
+    run_id: int
+    created_users: int = 0
+    created_employees: int = 0
+    # ID записей, созданных прогоном: удаляются только они, засеянные данные не трогаются
+    deletable_users: list[int] = field(default_factory=list)
+    deletable_employees: list[int] = field(default_factory=list)
+    # Курсоры постраничного обхода списков, общие для всех воркеров
+    cursors: dict[str, str | None] = field(default_factory=dict)
+
+    def seeded_telegram_id(self) -> int:
+        return TELEGRAM_ID_BASE + self.rng.randrange(self.users)
+
+    def employee_telegram_id(self) -> int:
+        return TELEGRAM_ID_BASE + self.rng.randrange(self.employees)
+
+    # После seed --reset ID идут подряд с 1 в порядке наполнения
+    def seeded_user_id(self) -> int:
+        return 1 + self.rng.randrange(self.users)
+
+    def seeded_employee_id(self) -> int:
+        return 1 + self.rng.randrange(self.employees)
+
+    def telegram_ids(self, count: int) -> list[int]:
+        return [self.seeded_telegram_id() for _ in range(count)]
+
+
+@dataclass
+class OperationStats:
+    """Задержки и ошибки одной операции"""
+    latencies: list[float] = field(default_factory=list)
+    errors: int = 0
+    # Неожиданные ответы 4xx: 404 от ненаполненной БД или регресс не должны выглядеть быстрым успехом
+    client_errors: int = 0
+    # Ответы 503 от контроля допуска: перегрузка, а не сбой
+    shed: int = 0
+
+    def summary(self, duration: float) -> dict[str, float | int]:
+        """Пропускная способность и перцентили задержки"""
+        latencies = sorted(self.latencies)
+        return {
+            "count": len(latencies),
+            "errors": self.errors,
+            "client_errors": self.client_errors,
+            "shed": self.shed,
+            "throughput_rps": len(latencies) / duration,
+            "mean_ms": sum(latencies) / len(latencies) * 1000 if latencies else 0.0,
+            "p50_ms": percentile(latencies, 50),
+            "p95_ms": percentile(latencies, 95),
+            "p99_ms": percentile(latencies, 99),
+        }
+
+
+def percentile(sorted_values: list[float], q: float) -> float:
+    """Перцентиль методом ближайшего ранга, в миллисекундах"""
+    if not sorted_values:
+        return 0.0
+    rank = min(len(sorted_values) - 1, max(0, math.ceil(q / 100 * len(sorted_values)) - 1))
+    return sorted_values[rank] * 1000
+
+
+# USERS OPERATIONS
+async def get_user_by_telegram(client: httpx.AsyncClient, ctx: LoadContext) -> httpx.Response:
+    return await client.get(f"/users/telegram/{ctx.seeded_telegram_id()}")
+
+
+async def patch_user_by_telegram(client: httpx.AsyncClient, ctx: LoadContext) -> httpx.Response:
+    return await client.patch(
+        f"/users/telegram/{ctx.seeded_telegram_id()}",
+        json={"first_name": ctx.rng.choice(["Иван", "Анна", "Олег"])},
+    )
+
+
+async def create_user(client: httpx.AsyncClient, ctx: LoadContext) -> httpx.Response:
+    ctx.created_users += 1
+    # Диапазон ID зависит от прогона, чтобы повторные запуски не конфликтовали
+    id_telegram = 1_500_000_000 + ctx.run_id * 1_000_000 + ctx.created_users
+    response = await client.post("/users/", json={"id_telegram": id_telegram, "first_name": "Нагрузка"})
+    if response.status_code == 200:
+        ctx.deletable_users.append(response.json()["user_id"])
+    return response
+
+
+async def get_user(client: httpx.AsyncClient, ctx: LoadContext) -> httpx.Response:
+    return await client.get(f"/users/{ctx.seeded_user_id()}")
+
+
+async def patch_user(client: httpx.AsyncClient, ctx: LoadContext) -> httpx.Response:
+    return await client.patch(
+        f"/users/{ctx.seeded_user_id()}", json={"last_name": ctx.rng.choice(["Иванов", "Петров", "Смирнов"])}
+    )
+
+
+async def delete_user(client: httpx.AsyncClient, ctx: LoadContext) -> httpx.Response:
+    if not ctx.deletable_users:
+        await create_user(client, ctx)
+    if not ctx.deletable_users:
+        raise RuntimeError("Не удалось создать запись для удаления")
+    return await client.delete(f"/users/{ctx.deletable_users.pop()}")
+
+
+# EMPLOYEES OPERATIONS
+async def get_employee_by_telegram(client: httpx.AsyncClient, ctx: LoadContext) -> httpx.Response:
+    return await client.get(f"/employees/telegram/{ctx.employee_telegram_id()}")
+
+
+async def patch_employee_by_telegram(client: httpx.AsyncClient, ctx: LoadContext) -> httpx.Response:
+    return await client.patch(
+        f"/employees/telegram/{ctx.employee_telegram_id()}",
+        json={"position": ctx.rng.choice(["Инженер", "Аналитик", "Менеджер"])},
+    )
+
+
+async def create_employee(client: httpx.AsyncClient, ctx: LoadContext) -> httpx.Response:
+    # Карточки создаются для засеянных пользователей без сотрудника
+    index = ctx.employees + ctx.created_employees
+    ctx.created_employees += 1
+    if index >= ctx.users:
+        raise RuntimeError("Закончились пользователи без карточки сотрудника")
+    record = employee_record(index, TELEGRAM_ID_BASE + index, zup_prefix=f"LOAD{ctx.run_id}")
+    response = await client.post("/employees/", json=json.loads(json.dumps(record, default=str)))
+    if response.status_code == 200:
+        ctx.deletable_employees.append(response.json()["employee_id"])
+    return response
+
+
+async def get_employee(client: httpx.AsyncClient, ctx: LoadContext) -> httpx.Response:
+    return await client.get(f"/employees/{ctx.seeded_employee_id()}")
+
+
+async def patch_employee(client: httpx.AsyncClient, ctx: LoadContext) -> httpx.Response:
+    return await client.patch(
+        f"/employees/{ctx.seeded_employee_id()}",
+        json={"department": ctx.rng.choice(["Отдел 1", "Отдел 2", "Отдел 3"])},
+    )
+
+
+async def delete_employee(client: httpx.AsyncClient, ctx: LoadContext) -> httpx.Response:
+    if not ctx.deletable_employees:
+        await create_employee(client, ctx)
+    if not ctx.deletable_employees:
+        raise RuntimeError("Не удалось создать запись для удаления")
+    return await client.delete(f"/employees/{ctx.deletable_employees.pop()}")
+
+
+# LISTS OPERATIONS
+async def _walk(client: httpx.AsyncClient, ctx: LoadContext, path: str, **params) -> httpx.Response:
+    """Следующая страница списка: курсор берется из предыдущего ответа, в конце обход начинается заново"""
+    cursor = ctx.cursors.get(path)
+    if cursor is not None:
+        params["cursor"] = cursor
+    response = await client.get(path, params=params)
+    if response.status_code == 200:
+        ctx.cursors[path] = response.json()["next_cursor"]
+    return response
+
+
+async def list_users(client: httpx.AsyncClient, ctx: LoadContext) -> httpx.Response:
+    return await _walk(client, ctx, "/users/", limit=100)
+
+
+async def list_employees(client: httpx.AsyncClient, ctx: LoadContext) -> httpx.Response:
+    return await _walk(client, ctx, "/employees/", limit=100)
+
+
+async def list_employees_filtered(client: httpx.AsyncClient, ctx: LoadContext) -> httpx.Response:
+    return await client.get(
+        "/employees/", params={"limit": 100, "department": f"Отдел {ctx.rng.randrange(50)}", "is_working": True}
+    )
+
+
+async def search_employees(client: httpx.AsyncClient, ctx: LoadContext) -> httpx.Response:
+    return await client.get(
+        "/employees/search", params={"q": ctx.rng.choice(["Иванов", "Петр", "Аналитик", "Отдел 1"]), "limit": 20}
+    )
+
+
+async def batch_users(client: httpx.AsyncClient, ctx: LoadContext) -> httpx.Response:
+    return await client.post("/users/telegram:batch", json={"ids": ctx.telegram_ids(100)})
+
+
+async def batch_employees(client: httpx.AsyncClient, ctx: LoadContext) -> httpx.Response:
+    return await client.post("/employees/telegram:batch", json={"ids": ctx.telegram_ids(100)})
+
+
+async def user_changes(client: httpx.AsyncClient, ctx: LoadContext) -> httpx.Response:
+    return await client.get("/users/changes", params={"limit": 500})
+
+
+async def export_users(client: httpx.AsyncClient, ctx: LoadContext) -> httpx.Response:
+    return await client.get("/users/export")
+
+
+async def export_employees(client: httpx.AsyncClient, ctx: LoadContext) -> httpx.Response:
+    return await client.get("/employees/export", params={"format": "csv"})
+
+
+# ADMIN OPERATIONS
+async def get_cache_stats(client: httpx.AsyncClient, ctx: LoadContext) -> httpx.Response:
+    return await client.get("/admin/cache")
+
+
+# Ожидаемые статусы операции; прочие 4xx считаются ошибками
+OK = frozenset({200})
+
+# Смеси операций по роутерам: (метка маршрута, вес, операция, ожидаемые статусы)
+SCENARIOS: dict[str, list[tuple[str, int, Operation, frozenset[int]]]] = {
+    "admin_router": [
+        ("GET /admin/cache", 100, get_cache_stats, OK),
+    ],
+    "users_router": [
+        ("GET /users/telegram/{id_telegram}", 60, get_user_by_telegram, OK),
+        ("GET /users/{user_id}", 25, get_user, OK),
+        ("PATCH /users/telegram/{id_telegram}", 6, patch_user_by_telegram, OK),
+        ("PATCH /users/{user_id}", 4, patch_user, OK),
+        ("POST /users/", 3, create_user, OK),
+        ("DELETE /users/{user_id}", 2, delete_user, OK),
+    ],
+    "employees_router": [
+        ("GET /employees/telegram/{id_telegram}", 60, get_employee_by_telegram, OK),
+        ("GET /employees/{employee_id}", 25, get_employee, OK),
+        ("PATCH /employees/telegram/{id_telegram}", 6, patch_employee_by_telegram, OK),
+        ("PATCH /employees/{employee_id}", 4, patch_employee, OK),
+        ("POST /employees/", 3, create_employee, OK),
+        ("DELETE /employees/{employee_id}", 2, delete_employee, OK),
+    ],
+    # Тяжелые чтения: страницы, поиск, пакетные запросы, лента изменений и полные выгрузки
+    "lists": [
+        ("GET /users/", 25, list_users, OK),
+        ("GET /employees/", 25, list_employees, OK),
+        ("GET /employees/?department", 10, list_employees_filtered, OK),
+        ("GET /employees/search", 10, search_employees, OK),
+        ("POST /users/telegram:batch", 12, batch_users, OK),
+        ("POST /employees/telegram:batch", 12, batch_employees, OK),
+        ("GET /users/changes", 4, user_changes, OK),
+        ("GET /users/export", 1, export_users, OK),
+        ("GET /employees/export", 1, export_employees, OK),
+    ],
+}
+
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    ctx: LoadContext,
+    scenario: list[tuple[str, int, Operation, frozenset[int]]],
+    concurrency: int,
+    duration: float,
+    warmup: float,
+) -> dict[str, dict]:
+    """Гоняет смесь операций заданным числом воркеров и собирает статистику"""
+    labels = [label for label, _, _, _ in scenario]
+    weights = [weight for _, weight, _, _ in scenario]
+    operations = {label: operation for label, _, operation, _ in scenario}
+    expected = {label: statuses for label, _, _, statuses in scenario}
+    stats: dict[str, OperationStats] = defaultdict(OperationStats)
+
+    started = time.perf_counter()
+    measure_from = started + warmup
+    deadline = measure_from + duration
+
+    async def worker() -> None:
+        while (now := time.perf_counter()) < deadline:
+            label = ctx.rng.choices(labels, weights)[0]
+            status = None
+            try:
+                response = await operations[label](client, ctx)
+                status = response.status_code
+            except (httpx.HTTPError, RuntimeError):
+                pass
+            elapsed = time.perf_counter() - now
+            if now < measure_from:
+                continue
+            if status in expected[label]:
+                stats[label].latencies.append(elapsed)
+            elif status == 503:
+                stats[label].shed += 1
+            elif status is not None and status < 500:
+                stats[label].client_errors += 1
+            else:
+                stats[label].errors += 1
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return {label: stats[label].summary(duration) for label in labels}
+
+
+def git_revision() -> str | None:
+    """Текущий коммит, чтобы отчет можно было сопоставить с версией кода"""
+    try:
+        return subprocess.check_output(["git", "rev-parse", "HEAD"], text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run(args: argparse.Namespace) -> dict:
+    """Прогоняет выбранные роутеры по очереди и собирает отчет"""
+    ctx = LoadContext(
+        rng=random.Random(args.seed),
+        users=args.users,
+        employees=args.employees,
+        run_id=int(time.time()) % 500,
+    )
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "git_revision": git_revision(),
+            "python": platform.python_version(),
+            "url": args.url,
+            "concurrency": args.concurrency,
+            "duration_s": args.duration,
+            "warmup_s": args.warmup,
+            "users": args.users,
+            "employees": args.employees,
+            "seed": args.seed,
+        },
+        "routers": {},
+    }
+    async with httpx.AsyncClient(base_url=args.url, limits=limits, timeout=args.timeout) as client:
+        for router in args.routers:
+            print(f"Прогон {router}...")
+            report["routers"][router] = await run_scenario(
+                client, ctx, SCENARIOS[router], args.concurrency, args.duration, args.warmup
+            )
+    return report
+
+
+def print_report(report: dict) -> None:
+    for router, operations in report["routers"].items():
+        print(f"\n{router}")
+        for label, summary in operations.items():
+            print(
+                f"  {label:<45} {summary['throughput_rps']:8.1f} rps  "
+                f"p50 {summary['p50_ms']:7.2f}  p95 {summary['p95_ms']:7.2f}  "
+                f"p99 {summary['p99_ms']:7.2f} ms  errors {summary['errors']}  "
+                f"4xx {summary['client_errors']}  shed {summary['shed']}"
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Нагрузочный тест роутеров сервиса")
+    parser.add_argument("--url", default="http://localhost:4444")
+    parser.add_argument("--routers", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=30.0, help="Длительность замера, с")
+    parser.add_argument("--warmup", type=float, default=5.0, help="Разогрев перед замером, с")
+    parser.add_argument("--timeout", type=float, default=10.0)
+    parser.add_argument("--users", type=int, default=50_000, help="Как при запуске benchmarks.seed")
+    parser.add_argument("--employees", type=int, default=40_000, help="Как при запуске benchmarks.seed")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default="bench_output.json")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    print_report(report)
+    with open(args.output, "w") as file:
+        json.dump(report, file, indent=2, ensure_ascii=False)
+    print(f"\nОтчет сохранен в {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Проверка, что поиск сотрудников идет по индексу, и замер его задержки
+
+Для каждого запроса выполняется EXPLAIN ANALYZE того же оператора, что строит
+GET /employees/search, затем запрос повторяется и считаются p50/p95. Скрипт
+завершается с кодом 1, если хотя бы один план не использует индекс поиска.
+Данные — из benchmarks.seed (для наглядности 100k+ сотрудников):
+
+    python -m benchmarks.seed --users 150000 --employees 120000 --reset
+    python -m benchmarks.search --repeat 20
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from typing import Any, Iterator
+
+from sqlalchemy import func, select, text
+from sqlalchemy.dialects import postgresql
+
+from src.api.routes.employees import EMPLOYEE_COLUMNS
+from src.database import SEARCH_INDEX, AsyncSessionLocal, EmployeeModel, engine, search_employees_query
+
+# Фамилия, имя, часть логина, подразделение, должность и фамилия с опечаткой
+DEFAULT_QUERIES = ["Иванов", "анна", "zup_login_4242", "Отдел 17", "Аналитик", "Кузнеов"]
+
+
+def _plan_nodes(plan: dict[str, Any]) -> Iterator[dict[str, Any]]:
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from _plan_nodes(child)
+
+
+async def check_query(q: str, limit: int, repeat: int) -> bool:
+    """Печатает план и задержку запроса; True — план использует индекс поиска"""
+    statement = search_employees_query(EMPLOYEE_COLUMNS, q, limit)
+    compiled = statement.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True})
+
+    async with AsyncSessionLocal() as session:
+        explain = await session.execute(text(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {compiled}"))
+        plan = explain.scalar_one()[0]["Plan"]
+        nodes = list(_plan_nodes(plan))
+        indexes = {node["Index Name"] for node in nodes if "Index Name" in node}
+        seq_scans = [node for node in nodes if node["Node Type"] == "Seq Scan"]
+
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            rows = (await session.execute(statement)).all()
+            timings.append((time.perf_counter() - started) * 1000)
+
+    indexed = SEARCH_INDEX in indexes and not seq_scans
+    timings.sort()
+    p95 = timings[min(len(timings) - 1, round(0.95 * len(timings)) - 1)]
+    print(
+        f"{q!r:>20}: строк {len(rows):>3}, p50 {statistics.median(timings):7.2f} мс, p95 {p95:7.2f} мс, "
+        f"план {plan['Node Type']} ({', '.join(sorted(indexes)) or 'без индексов'}) — "
+        f"{'индекс' if indexed else 'ПОЛНЫЙ ПРОСМОТР'}"
+    )
+    return indexed
+
+
+async def run(queries: list[str], limit: int, repeat: int) -> bool:
+    async with AsyncSessionLocal() as session:
+        total = (await session.execute(select(func.count()).select_from(EmployeeModel))).scalar_one()
+    print(f"Сотрудников в БД: {total}")
+    results = [await check_query(q, limit, repeat) for q in queries]
+    return all(results)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Проверка индексного поиска сотрудников")
+    parser.add_argument("queries", nargs="*", default=DEFAULT_QUERIES)
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    async def run_and_dispose() -> bool:
+        try:
+            return await run(args.queries, args.limit, args.repeat)
+        finally:
+            await engine.dispose()
+
+    if not asyncio.run(run_and_dispose()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
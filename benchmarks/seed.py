@@ -0,0 +1,108 @@
+"""Наполнение локальной PostgreSQL (из docker-compose.yml) тестовыми данными
+
+Пользователи получают Telegram ID начиная с TELEGRAM_ID_BASE, первые
+--employees из них — карточки сотрудников. Остальные пользователи без
+карточек нужны сценарию создания сотрудников в нагрузочном тесте.
+
+    python -m benchmarks.seed --users 50000 --employees 40000 --reset
+"""
+import argparse
+import asyncio
+import random
+from datetime import date, timedelta
+
+from src.database import engine, init_db
+from src.schemas import EmployeeCreateSchema
+
+TELEGRAM_ID_BASE = 1_000_000
+EMPLOYEE_COLUMNS = list(EmployeeCreateSchema.model_fields)
+DEPARTMENTS = [f"Отдел {i}" for i in range(50)]
+ORGANISATIONS = ["ООО Ромашка", "АО Лютик", "ПАО Василек"]
+POSITIONS = ["Инженер", "Аналитик", "Бухгалтер", "Менеджер", "Разработчик"]
+FIRST_NAMES = ["Иван", "Петр", "Анна", "Мария", "Олег", "Елена"]
+LAST_NAMES = ["Иванов", "Петров", "Сидоров", "Смирнов", "Кузнецов"]
+
+
+def user_records(count: int):
+    """Кортежи пользователей для COPY"""
+    for i in range(count):
+        yield (TELEGRAM_ID_BASE + i, f"user_{i}", random.choice(FIRST_NAMES), random.choice(LAST_NAMES))
+
+
+def employee_record(i: int, id_telegram: int, zup_prefix: str = "ZUP") -> dict:
+    """Поля карточки сотрудника, совпадающие с EmployeeCreateSchema"""
+    first_name, last_name = random.choice(FIRST_NAMES), random.choice(LAST_NAMES)
+    organisation = random.choice(ORGANISATIONS)
+    department = random.choice(DEPARTMENTS)
+    birth = date(1970, 1, 1) + timedelta(days=random.randrange(12000))
+    return {
+        "id_telegram": id_telegram,
+        "zup_id": f"{zup_prefix}-{i:08d}",
+        "login": f"{zup_prefix.lower()}_login_{i}",
+        "first_name": first_name,
+        "last_name": last_name,
+        "middle_name": None,
+        "full_name": f"{last_name} {first_name}",
+        "age": 2025 - birth.year,
+        "date_of_birth": birth,
+        "gender": random.choice(["male", "female"]),
+        "position": random.choice(POSITIONS),
+        "department": department,
+        "organisation": organisation,
+        "full_org_structure": f"{organisation} / Дирекция {department[-1]} / {department}",
+        "date_of_start": date(2015, 1, 1) + timedelta(days=random.randrange(3000)),
+        "date_of_end": None,
+        "phone": f"+7999{i:07d}",
+        "email": f"user{i}@example.com",
+        "is_working": random.random() > 0.1,
+    }
+
+
+async def seed(users: int, employees: int, reset: bool) -> None:
+    """Загружает пользователей и сотрудников бинарным COPY"""
+    if reset:
+        await init_db()
+
+    async with engine.connect() as conn:
+        raw_connection = await conn.get_raw_connection()
+        driver_connection = raw_connection.driver_connection
+        async with driver_connection.transaction():
+            await driver_connection.copy_records_to_table(
+                "users",
+                records=user_records(users),
+                columns=["id_telegram", "username", "first_name", "last_name"],
+            )
+            records = (employee_record(i, TELEGRAM_ID_BASE + i) for i in range(employees))
+            await driver_connection.copy_records_to_table(
+                "employees",
+                records=(tuple(record[column] for column in EMPLOYEE_COLUMNS) for record in records),
+                columns=EMPLOYEE_COLUMNS,
+            )
+        await driver_connection.execute("ANALYZE users")
+        await driver_connection.execute("ANALYZE employees")
+    print(f"Создано пользователей: {users}, сотрудников: {employees}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Наполнение БД тестовыми данными")
+    parser.add_argument("--users", type=int, default=50_000)
+    parser.add_argument("--employees", type=int, default=40_000)
+    parser.add_argument("--reset", action="store_true", help="Пересоздать таблицы перед наполнением")
+    parser.add_argument("--seed", type=int, default=42, help="Зерно генератора для воспроизводимости")
+    args = parser.parse_args()
+    if args.employees > args.users:
+        parser.error("--employees не может превышать --users")
+
+    random.seed(args.seed)
+
+    async def run() -> None:
+        try:
+            await seed(args.users, args.employees, args.reset)
+        finally:
+            await engine.dispose()
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""Сравнение стоимости сериализации строки списка сотрудников
+
+Текущий путь FastAPI: ORM-объекты -> EmployeeSchema (from_attributes) ->
+JSON-совместимые структуры -> json.dumps. Быстрый путь: кортежи колонок ->
+словари -> orjson. БД не нужна: строки генерируются в памяти.
+
+    python -m benchmarks.serialization --rows 10000 --repeat 5
+"""
+import argparse
+import json
+import statistics
+import time
+from datetime import date, timedelta
+from typing import Callable
+
+import orjson
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+from src.api.responses import rows_to_dicts
+from src.database import EmployeeModel
+from src.schemas import EmployeeSchema
+
+FIELDS = list(EmployeeSchema.model_fields)
+
+
+def make_rows(count: int) -> list[tuple]:
+    """Генерирует кортежи строк в порядке полей EmployeeSchema"""
+    rows = []
+    for i in range(count):
+        values = {
+            "id_telegram": 100_000 + i,
+            "zup_id": f"ZUP-{i:08d}",
+            "login": f"user{i}",
+            "first_name": "Иван",
+            "last_name": "Иванов",
+            "middle_name": "Иванович",
+            "full_name": "Иванов Иван Иванович",
+            "age": 30 + i % 30,
+            "date_of_birth": date(1990, 1, 1) + timedelta(days=i % 3650),
+            "gender": "male",
+            "position": "Инженер",
+            "department": f"Отдел {i % 50}",
+            "organisation": "ООО Ромашка",
+            "full_org_structure": f"ООО Ромашка / Дирекция {i % 5} / Отдел {i % 50}",
+            "date_of_start": date(2020, 1, 1) + timedelta(days=i % 1000),
+            "date_of_end": None,
+            "phone": "+79990000000",
+            "email": f"user{i}@example.com",
+            "is_working": True,
+            "id": i + 1,
+        }
+        rows.append(tuple(values[field] for field in FIELDS))
+    return rows
+
+
+def current_path(rows: list[tuple]) -> bytes:
+    """ORM-гидратация, повторная валидация и стандартный кодировщик FastAPI"""
+    employees = [EmployeeModel(**dict(zip(FIELDS, row))) for row in rows]
+    items = TypeAdapter(list[EmployeeSchema]).validate_python(employees, from_attributes=True)
+    content = jsonable_encoder({"items": items, "next_cursor": None})
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def fast_path(rows: list[tuple]) -> bytes:
+    """Кортежи колонок напрямую в orjson"""
+    return orjson.dumps({"items": rows_to_dicts(FIELDS, rows), "next_cursor": None})
+
+
+def measure(fn: Callable[[list[tuple]], bytes], rows: list[tuple], repeat: int) -> dict[str, float]:
+    """Медианное время вызова и стоимость одной строки в микросекундах"""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        payload = fn(rows)
+        timings.append(time.perf_counter() - started)
+    median = statistics.median(timings)
+    return {
+        "median_ms": median * 1000,
+        "per_row_us": median / len(rows) * 1_000_000,
+        "bytes": len(payload),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="Сохранить результаты в JSON-файл")
+    args = parser.parse_args()
+
+    rows = make_rows(args.rows)
+    results = {
+        "rows": args.rows,
+        "current": measure(current_path, rows, args.repeat),
+        "fast": measure(fast_path, rows, args.repeat),
+    }
+    results["speedup"] = results["current"]["median_ms"] / results["fast"]["median_ms"]
+
+    for name in ("current", "fast"):
+        result = results[name]
+        print(
+            f"{name:>8}: {result['median_ms']:9.2f} ms, "
+            f"{result['per_row_us']:7.2f} us/row, {result['bytes']} bytes"
+        )
+    print(f" speedup: {results['speedup']:.1f}x")
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
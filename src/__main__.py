@@ -1,14 +1,34 @@
+import logging
+
 import uvicorn
 
 from src.config import settings
 from src.core.app import create_app
 
+logger = logging.getLogger(__name__)
+
 app = create_app()
 
 if __name__ == "__main__":
-    uvicorn.run(
-        "src.__main__:app",
-        host=settings.host,
-        port=settings.port,
-        reload=True,
-    )
\ No newline at end of file
+    if settings.environment == "production":
+        logging.basicConfig(level=logging.INFO)
+        logger.info(
+            f"Запуск в production: воркеров {settings.worker_count}, "
+            f"пул на воркер {settings.pool_size} + {settings.pool_max_overflow}"
+        )
+        uvicorn.run(
+            "src.__main__:app",
+            host=settings.host,
+            port=settings.port,
+            workers=settings.worker_count,
+            loop="uvloop",
+            http="httptools",
+            reload=False,
+        )
+    else:
+        uvicorn.run(
+            "src.__main__:app",
+            host=settings.host,
+            port=settings.port,
+            reload=True,
+        )
\ No newline at end of file
@@ -0,0 +1,34 @@
+from typing import Sequence
+
+from fastapi.responses import Response
+from sqlalchemy import ColumnElement
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..database import EmployeeModel, UserModel, fetch_changes
+from .encoding import Negotiated
+from .pagination import decode_cursor, encode_cursor
+
+
+async def changes_response(
+    session: AsyncSession,
+    model: type[UserModel] | type[EmployeeModel],
+    columns: Sequence[ColumnElement],
+    since: str | None,
+    limit: int,
+    encoding: Negotiated,
+) -> Response:
+    """Создает ответ со страницей ленты изменений после курсора since
+
+    Без курсора лента начинается с начала и отдает всю таблицу; курсор из
+    ответа нужно сохранить и передать в следующем опросе, даже если изменений не было.
+    """
+    after = (0, 0)
+    if since is not None:
+        position = decode_cursor(since, xid=int, seq=int)
+        after = (position["xid"], position["seq"])
+
+    page = await fetch_changes(session, model, columns, after, limit)
+    xid, seq = page.position
+    return encoding.response(
+        {"changes": page.changes, "next_cursor": encode_cursor(xid=xid, seq=seq), "has_more": page.has_more}
+    )
@@ -0,0 +1,66 @@
+import hashlib
+from typing import Any, Iterable
+
+from fastapi import HTTPException, Response
+
+from .encoding import VARY
+from .responses import json_response
+
+
+def record_etag(version: int) -> str:
+    """Сильный ETag записи: номер ее последнего изменения"""
+    return f'"{version}"'
+
+
+def page_etag(versions: Iterable[int], next_cursor: str | None) -> str:
+    """Слабый ETag страницы по версиям ее строк: change_seq уникален для каждой записи в БД"""
+    digest = hashlib.blake2b(digest_size=16)
+    for version in versions:
+        digest.update(f"{version};".encode())
+    digest.update((next_cursor or "").encode())
+    return f'W/"{digest.hexdigest()}"'
+
+
+def _tags(header: str) -> list[str]:
+    return [tag.strip() for tag in header.split(",") if tag.strip()]
+
+
+def none_match(if_none_match: str | None, etag: str) -> bool:
+    """Проверяет If-None-Match слабым сравнением: True — у клиента актуальная версия"""
+    if if_none_match is None:
+        return False
+    tags = _tags(if_none_match)
+    return "*" in tags or etag.removeprefix("W/") in (tag.removeprefix("W/") for tag in tags)
+
+
+def not_modified(etag: str) -> Response:
+    """Ответ 304 без тела"""
+    return Response(status_code=304, headers={"ETag": etag, "Vary": VARY})
+
+
+def record_response(record: dict[str, Any], if_none_match: str | None) -> Response:
+    """Ответ с записью {"version", "data"} или 304, если версия у клиента актуальна"""
+    etag = record_etag(record["version"])
+    if none_match(if_none_match, etag):
+        return not_modified(etag)
+    return json_response(record["data"], headers={"ETag": etag})
+
+
+def if_match_versions(if_match: str | None) -> list[int] | None:
+    """Версии из If-Match; None — заголовка нет или он равен "*" (подходит любая версия)
+
+    If-Match сравнивается строго: слабые и чужие ETag не совпадают ни с одной версией.
+    """
+    if if_match is None:
+        return None
+    tags = _tags(if_match)
+    if "*" in tags:
+        return None
+    versions = []
+    for tag in tags:
+        value = tag[1:-1] if len(tag) > 2 and tag[0] == tag[-1] == '"' else ""
+        if value.isdigit():
+            versions.append(int(value))
+    if not versions:
+        raise HTTPException(status_code=412, detail="Precondition failed")
+    return versions
@@ -1,8 +1,26 @@
-from typing import Annotated
+from typing import Annotated, AsyncGenerator
 
 from fastapi import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..database import get_session
+from ..core.admission import read_admission, write_admission
+from ..database import AsyncSessionLocal, read_session
 
-SessionDep = Annotated[AsyncSession, Depends(get_session)]
\ No newline at end of file
+
+async def _admitted_session() -> AsyncGenerator[AsyncSession, None]:
+    """Сессия основной БД в пределах бюджета записей; при перегрузке — 503"""
+    async with write_admission.slot():
+        async with AsyncSessionLocal() as session:
+            yield session
+
+
+async def _admitted_read_session() -> AsyncGenerator[AsyncSession, None]:
+    """Сессия для чтения в пределах бюджета чтений; при перегрузке — 503"""
+    async with read_admission.slot():
+        async with read_session() as session:
+            yield session
+
+
+SessionDep = Annotated[AsyncSession, Depends(_admitted_session)]
+# Сессия для маршрутов только на чтение: уходит на реплику, если они настроены
+ReadSessionDep = Annotated[AsyncSession, Depends(_admitted_read_session)]
@@ -0,0 +1,133 @@
+import gzip
+import zlib
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Annotated, Any, AsyncIterator
+
+import orjson
+from fastapi import Depends, Request, Response
+
+from ..config import settings
+
+# Необязательные зависимости: без них соответствующий формат просто не предлагается
+try:
+    import msgpack
+except ImportError:  # pragma: no cover
+    msgpack = None
+try:
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None
+
+MSGPACK_AVAILABLE = msgpack is not None
+JSON_MEDIA_TYPE = "application/json"
+MSGPACK_MEDIA_TYPES = ("application/msgpack", "application/x-msgpack", "application/vnd.msgpack")
+VARY = "Accept, Accept-Encoding"
+
+
+def _quality(header: str | None) -> dict[str, float]:
+    """Разбирает Accept/Accept-Encoding в {значение: q}"""
+    values: dict[str, float] = {}
+    for item in (header or "").split(","):
+        value, *params = [part.strip() for part in item.split(";")]
+        if not value:
+            continue
+        q = 1.0
+        for param in params:
+            name, _, number = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    q = float(number)
+                except ValueError:
+                    q = 0.0
+        values[value.lower()] = q
+    return values
+
+
+def _msgpack_default(value: Any) -> Any:
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+def pack_msgpack(content: Any) -> bytes:
+    """Кодирует структуру в msgpack; даты — строками ISO, как в JSON"""
+    return msgpack.packb(content, default=_msgpack_default, use_bin_type=True)
+
+
+@dataclass(frozen=True)
+class Negotiated:
+    """Формат и сжатие ответа, выбранные по заголовкам Accept и Accept-Encoding"""
+    msgpack: bool = False
+    compression: str | None = None
+
+    @property
+    def media_type(self) -> str:
+        return MSGPACK_MEDIA_TYPES[0] if self.msgpack else JSON_MEDIA_TYPE
+
+    def encode(self, content: Any) -> bytes:
+        if self.msgpack:
+            return pack_msgpack(content)
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+    def compressor(self) -> Any:
+        """Потоковый компрессор с методами compress/flush"""
+        if self.compression == "zstd":
+            return zstandard.ZstdCompressor(level=settings.zstd_level).compressobj()
+        # wbits=31 — формат gzip, а не «голый» zlib
+        return zlib.compressobj(settings.gzip_level, zlib.DEFLATED, 31)
+
+    def response(
+        self, content: Any, status_code: int = 200, headers: dict[str, str] | None = None
+    ) -> Response:
+        """Ответ в выбранном формате; тело сжимается, только если оно не меньше порога"""
+        body = self.encode(content)
+        headers = {**(headers or {}), "Vary": VARY}
+        if self.compression is not None and len(body) >= settings.compression_min_size:
+            if self.compression == "zstd":
+                body = zstandard.ZstdCompressor(level=settings.zstd_level).compress(body)
+            else:
+                body = gzip.compress(body, compresslevel=settings.gzip_level, mtime=0)
+            headers["Content-Encoding"] = self.compression
+        return Response(content=body, status_code=status_code, headers=headers, media_type=self.media_type)
+
+    async def stream(self, chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+        """Сжимает поток по частям: в памяти только текущая часть и окно компрессора"""
+        if self.compression is None:
+            async for chunk in chunks:
+                yield chunk
+            return
+        compressor = self.compressor()
+        async for chunk in chunks:
+            compressed = compressor.compress(chunk)
+            if compressed:
+                yield compressed
+        yield compressor.flush()
+
+    def stream_headers(self) -> dict[str, str]:
+        """Заголовки потокового ответа: размер заранее неизвестен, поэтому порога нет"""
+        headers = {"Vary": VARY}
+        if self.compression is not None:
+            headers["Content-Encoding"] = self.compression
+        return headers
+
+
+def negotiate(request: Request) -> Negotiated:
+    """Выбирает msgpack при явном предпочтении в Accept и лучшее из zstd/gzip в Accept-Encoding"""
+    accept = _quality(request.headers.get("accept"))
+    msgpack_q = max((accept.get(media_type, 0.0) for media_type in MSGPACK_MEDIA_TYPES), default=0.0)
+    json_q = max(accept.get(JSON_MEDIA_TYPE, 0.0), accept.get("*/*", 0.0))
+    use_msgpack = MSGPACK_AVAILABLE and msgpack_q > 0 and msgpack_q >= json_q
+
+    accept_encoding = _quality(request.headers.get("accept-encoding"))
+    available: list[str] = ["zstd"] if zstandard is not None else []
+    available.append("gzip")
+    candidates = [
+        (accept_encoding.get(name, accept_encoding.get("*", 0.0)), -rank, name)
+        for rank, name in enumerate(available)
+    ]
+    q, _, compression = max(candidates)
+    return Negotiated(msgpack=use_msgpack, compression=compression if q > 0 else None)
+
+
+NegotiatedDep = Annotated[Negotiated, Depends(negotiate)]
@@ -0,0 +1,93 @@
+import csv
+import io
+from enum import Enum
+from typing import AsyncIterator, Sequence
+
+import orjson
+from fastapi import HTTPException
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Select
+from starlette.background import BackgroundTask
+
+from ..config import settings
+from ..core.admission import Slot, read_admission
+from ..database import read_session
+from .encoding import MSGPACK_AVAILABLE, MSGPACK_MEDIA_TYPES, Negotiated, pack_msgpack
+
+
+class ExportFormat(str, Enum):
+    """Формат выгрузки"""
+    ndjson = "ndjson"
+    csv = "csv"
+    msgpack = "msgpack"
+
+
+MEDIA_TYPES = {
+    ExportFormat.ndjson: "application/x-ndjson",
+    ExportFormat.csv: "text/csv; charset=utf-8",
+    # Поток подряд идущих msgpack-объектов, по одному на строку
+    ExportFormat.msgpack: MSGPACK_MEDIA_TYPES[0],
+}
+
+
+async def _export_rows(
+    query: Select, fields: Sequence[str], export_format: ExportFormat, slot: Slot
+) -> AsyncIterator[bytes]:
+    """Построчно отдает результат запроса колонок через серверный курсор"""
+    try:
+        async with read_session() as session:
+            # Вся выгрузка читается из одного снимка, параллельные записи в нее не попадают
+            await session.connection(
+                execution_options={"isolation_level": "REPEATABLE READ", "postgresql_readonly": True}
+            )
+            result = await session.stream(query.execution_options(yield_per=settings.export_batch_size))
+
+            if export_format is ExportFormat.csv:
+                buffer = io.StringIO()
+                writer = csv.writer(buffer)
+                writer.writerow(fields)
+                yield buffer.getvalue().encode()
+
+            async for partition in result.partitions():
+                if export_format is ExportFormat.ndjson:
+                    yield b"".join(orjson.dumps(dict(zip(fields, row))) + b"\n" for row in partition)
+                elif export_format is ExportFormat.msgpack:
+                    yield b"".join(pack_msgpack(dict(zip(fields, row))) for row in partition)
+                else:
+                    buffer = io.StringIO()
+                    writer = csv.writer(buffer)
+                    writer.writerows(partition)
+                    yield buffer.getvalue().encode()
+    finally:
+        slot.release()
+
+
+async def export_response(
+    query: Select,
+    fields: Sequence[str],
+    export_format: ExportFormat | None,
+    filename: str,
+    encoding: Negotiated,
+) -> StreamingResponse:
+    """Создает потоковый ответ с выгрузкой в заданном формате, сжатый по Accept-Encoding
+
+    Без явного формата выбирается msgpack, если его предпочитает Accept, иначе NDJSON.
+
+    Место в бюджете чтений занимается до отправки заголовков, чтобы при перегрузке
+    ответить 503, и держится до конца выгрузки. Фоновая задача освобождает его,
+    если поток так и не был прочитан (клиент отключился до первого байта).
+    """
+    if export_format is None:
+        export_format = ExportFormat.msgpack if encoding.msgpack else ExportFormat.ndjson
+    if export_format is ExportFormat.msgpack and not MSGPACK_AVAILABLE:
+        raise HTTPException(status_code=400, detail="msgpack export is not available")
+    slot = await read_admission.acquire()
+    return StreamingResponse(
+        encoding.stream(_export_rows(query, fields, export_format, slot)),
+        background=BackgroundTask(slot.release),
+        media_type=MEDIA_TYPES[export_format],
+        headers={
+            **encoding.stream_headers(),
+            "Content-Disposition": f'attachment; filename="{filename}.{export_format.value}"',
+        },
+    )
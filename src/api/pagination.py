@@ -0,0 +1,36 @@
+import base64
+import binascii
+import json
+from typing import Any
+
+from fastapi import HTTPException
+
+
+def encode_cursor(**values: Any) -> str:
+    """Кодирует позицию страницы в непрозрачный курсор"""
+    payload = json.dumps(values, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+# Целые поля курсора сравниваются с колонками BIGINT
+BIGINT_MIN, BIGINT_MAX = -(2**63), 2**63 - 1
+
+
+def _valid(value: Any, field_type: type) -> bool:
+    if not isinstance(value, field_type) or isinstance(value, bool):
+        return False
+    return field_type is not int or BIGINT_MIN <= value <= BIGINT_MAX
+
+
+def decode_cursor(cursor: str, **fields: type) -> dict[str, Any]:
+    """Декодирует курсор и проверяет типы ожидаемых полей и диапазон целых"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if not isinstance(values, dict) or any(
+        not _valid(values.get(key), field_type) for key, field_type in fields.items()
+    ):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return values
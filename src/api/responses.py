@@ -0,0 +1,28 @@
+from typing import Any, Iterable, Sequence
+
+import orjson
+from fastapi import Response
+from pydantic import BaseModel
+from sqlalchemy import Column
+
+from ..database import Base
+
+
+def schema_columns(model: type[Base], schema: type[BaseModel]) -> list[Column]:
+    """Колонки таблицы модели в порядке полей схемы ответа"""
+    return [model.__table__.c[name] for name in schema.model_fields]
+
+
+def rows_to_dicts(fields: Sequence[str], rows: Iterable[Sequence[Any]]) -> list[dict[str, Any]]:
+    """Превращает кортежи строк в словари без создания ORM-объектов и моделей Pydantic"""
+    return [dict(zip(fields, row)) for row in rows]
+
+
+def json_response(content: Any, status_code: int = 200, headers: dict[str, str] | None = None) -> Response:
+    """JSON-ответ, закодированный orjson в обход jsonable_encoder"""
+    return Response(
+        content=orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS),
+        status_code=status_code,
+        headers=headers,
+        media_type="application/json",
+    )
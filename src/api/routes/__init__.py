@@ -1,9 +1,17 @@
 from .admin import router as admin_router
 from .users import router as users_router
 from .employees import router as employees_router
+from .profiles import router as profiles_router
+from .health import router as health_router
+from .org import router as org_router
+from .analytics import router as analytics_router
 
 __all__ = [
     "admin_router",
     "users_router",
     "employees_router",
-]
\ No newline at end of file
+    "profiles_router",
+    "health_router",
+    "org_router",
+    "analytics_router",
+]
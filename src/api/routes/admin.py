@@ -1,7 +1,17 @@
-from fastapi import APIRouter, HTTPException
+from typing import Annotated
+
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import PlainTextResponse
 import logging
 
-from ...database import init_db
+from ...core.admission import read_admission, write_admission
+from ...core.cache import EMPLOYEE_KEY_PREFIX, lookup_cache
+from ...core.metrics import render_gauges, render_metrics
+from ...core.singleflight import lookup_flights
+from ...database import engine, init_db, rebuild_summaries, replica_router
+from ...database.instrumentation import pool_stats
+from ...database.import_employees import ImportFormat, import_employees
+from ..dependencies import SessionDep
 
 router = APIRouter(prefix="/admin", tags=["Администрирование"])
 logger = logging.getLogger(__name__)
@@ -20,3 +30,51 @@ async def initialize_database():
             status_code=500,
             detail=f"Ошибка при инициализации БД: {str(e)}"
         )
+
+
+@router.post("/analytics/rebuild", summary="Пересчет сводных таблиц аналитики")
+async def rebuild_analytics(session: SessionDep):
+    """Пересчитывает сводки численности и приема с нуля (для БД, созданных до появления сводок)"""
+    await rebuild_summaries(session)
+    return {"status": "success", "message": "Analytics summaries rebuilt"}
+
+
+@router.get("/cache", summary="Статистика кэша и объединения запросов поиска")
+async def cache_stats():
+    """Возвращает счетчики кэша и объединения одновременных запросов"""
+    return {**lookup_cache.stats(), "single_flight": lookup_flights.stats()}
+
+
+@router.get("/metrics", response_class=PlainTextResponse, summary="Метрики в формате Prometheus")
+async def metrics():
+    """Возвращает метрики HTTP, БД, пула соединений и кэша текущего воркера"""
+    content = render_metrics(
+        render_gauges("db_pool_connections", "Состояние пула соединений с БД", pool_stats(engine)),
+        render_gauges("db_replicas", "Реплики для чтения: настроено и доступно", replica_router.stats()),
+        render_gauges("admission_read", "Допуск чтений к БД", read_admission.stats()),
+        render_gauges("admission_write", "Допуск записей к БД", write_admission.stats()),
+        render_gauges("lookup_cache", "Счетчики кэша поиска по Telegram ID", lookup_cache.stats()),
+        render_gauges("lookup_single_flight", "Объединение одновременных запросов", lookup_flights.stats()),
+    )
+    return PlainTextResponse(content, media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+@router.post("/import/employees", summary="Массовый импорт сотрудников из CSV/JSONL")
+async def import_employees_file(
+    request: Request,
+    import_format: Annotated[ImportFormat, Query(alias="format")] = ImportFormat.csv,
+):
+    """Загружает сотрудников из тела запроса (CSV или JSONL) через COPY и сливает по ZUP ID"""
+    logger.info(f"Получен запрос на импорт сотрудников ({import_format.value})")
+    result = await import_employees(request.stream(), import_format)
+    await lookup_cache.invalidate_prefix(EMPLOYEE_KEY_PREFIX)
+    return {
+        "status": "success",
+        "message": "Employees imported",
+        "processed": result.processed,
+        "created": result.created,
+        "updated": result.updated,
+        "unchanged": result.unchanged,
+        "rejected_count": result.rejected_count,
+        "rejected": [{"line": line, "detail": detail} for line, detail in result.rejected],
+    }
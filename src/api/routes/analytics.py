@@ -0,0 +1,80 @@
+from datetime import date
+from enum import Enum
+from typing import Annotated
+
+from fastapi import APIRouter, Query
+from sqlalchemy import func, select
+
+from ...database import HeadcountSummaryModel, HireSummaryModel
+from ...schemas import HeadcountSchema, HiresSchema
+from ..dependencies import ReadSessionDep
+from ..responses import json_response, rows_to_dicts
+
+router = APIRouter(prefix="/analytics", tags=["Аналитика"])
+
+
+class HeadcountDimension(str, Enum):
+    """Измерение группировки численности"""
+    organisation = "organisation"
+    department = "department"
+    position = "position"
+
+
+@router.get("/headcount", response_model=list[HeadcountSchema], summary="Численность сотрудников")
+async def get_headcount(
+    session: ReadSessionDep,
+    group_by: Annotated[list[HeadcountDimension], Query()] = [HeadcountDimension.organisation],
+    organisation: str | None = None,
+    department: str | None = None,
+) -> list[HeadcountSchema]:
+    """Возвращает численность, работающих и уволенных по выбранным измерениям из сводной таблицы"""
+    dimensions = [getattr(HeadcountSummaryModel, dimension.value) for dimension in dict.fromkeys(group_by)]
+    employees = HeadcountSummaryModel.employees
+    query = (
+        select(
+            *dimensions,
+            func.sum(employees).label("total"),
+            func.coalesce(func.sum(employees).filter(HeadcountSummaryModel.is_working), 0).label("working"),
+            func.coalesce(func.sum(employees).filter(HeadcountSummaryModel.terminated), 0).label("terminated"),
+        )
+        .group_by(*dimensions)
+        .having(func.sum(employees) > 0)
+        .order_by(*dimensions)
+    )
+    if organisation is not None:
+        query = query.where(HeadcountSummaryModel.organisation == organisation)
+    if department is not None:
+        query = query.where(HeadcountSummaryModel.department == department)
+
+    result = await session.execute(query)
+    fields = [dimension.key for dimension in dimensions] + ["total", "working", "terminated"]
+    return json_response(rows_to_dicts(fields, result.all()))
+
+
+@router.get("/hires", response_model=list[HiresSchema], summary="Прием сотрудников по месяцам")
+async def get_hires(
+    session: ReadSessionDep,
+    organisation: str | None = None,
+    department: str | None = None,
+    date_from: date | None = None,
+    date_to: date | None = None,
+) -> list[HiresSchema]:
+    """Возвращает число принятых сотрудников по месяцам начала работы из сводной таблицы"""
+    hires = func.sum(HireSummaryModel.hires)
+    query = (
+        select(HireSummaryModel.hire_month, hires)
+        .group_by(HireSummaryModel.hire_month)
+        .having(hires > 0)
+        .order_by(HireSummaryModel.hire_month)
+    )
+    if organisation is not None:
+        query = query.where(HireSummaryModel.organisation == organisation)
+    if department is not None:
+        query = query.where(HireSummaryModel.department == department)
+    if date_from is not None:
+        query = query.where(HireSummaryModel.hire_month >= date_from.replace(day=1))
+    if date_to is not None:
+        query = query.where(HireSummaryModel.hire_month <= date_to)
+
+    result = await session.execute(query)
+    return json_response(rows_to_dicts(["month", "hires"], result.all()))
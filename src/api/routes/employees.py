@@ -1,114 +1,311 @@
-from fastapi import APIRouter, HTTPException
-from sqlalchemy import select
+from typing import Annotated
 
-from ...database import EmployeeModel
-from ...schemas import EmployeeCreateSchema, EmployeeSchema, EmployeeUpdateSchema
-from ..dependencies import SessionDep
+from fastapi import APIRouter, Body, Header, HTTPException, Query
+from sqlalchemy import ColumnElement, RowMapping, Select, and_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
+
+from ...config import settings
+from ...core.admission import read_admission
+from ...core.cache import EMPLOYEE_KEY_PREFIX, employee_telegram_key, lookup_cache
+from ...core.singleflight import lookup_flights
+from ...database import (
+    EmployeeModel,
+    employees_repository,
+    read_session,
+    reads_pinned_to_primary,
+    search_employees_query,
+    upsert_employees,
+)
+from ...schemas import (
+    ChangesPageSchema,
+    EmployeeBulkResultSchema,
+    EmployeeCreateSchema,
+    EmployeeSchema,
+    EmployeeUpdateSchema,
+    PageSchema,
+    TelegramBatchSchema,
+)
+from ..changes import changes_response
+from ..conditional import if_match_versions, none_match, not_modified, page_etag, record_etag, record_response
+from ..dependencies import ReadSessionDep, SessionDep
+from ..encoding import NegotiatedDep
+from ..export import ExportFormat, export_response
+from ..pagination import decode_cursor, encode_cursor
+from ..responses import json_response, rows_to_dicts, schema_columns
+
+EMPLOYEE_COLUMNS = schema_columns(EmployeeModel, EmployeeSchema)
+EMPLOYEE_FIELDS = list(EmployeeSchema.model_fields)
+# Колонки записи с версией для ETag
+EMPLOYEE_RECORD_COLUMNS = [*EMPLOYEE_COLUMNS, EmployeeModel.__table__.c.change_seq]
 
 router = APIRouter(prefix="/employees", tags=["Сотрудники"])
 
 
+async def _load_employee(column: InstrumentedAttribute, value: int) -> dict | None:
+    """Загружает {"version", "data"} сотрудника в отдельной сессии, общей для объединенных запросов"""
+    async def load() -> dict | None:
+        async with read_admission.slot(), read_session() as session:
+            employee = await employees_repository.get(session, column == value, EMPLOYEE_RECORD_COLUMNS)
+            if not employee:
+                return None
+            data = EmployeeSchema.model_validate({field: employee[field] for field in EMPLOYEE_FIELDS}).model_dump(mode="json")
+            return {"version": employee["change_seq"], "data": data}
+
+    if reads_pinned_to_primary():
+        # Клиент только что писал: не берем результат чужой загрузки, возможно, с реплики
+        return await load()
+    return await lookup_flights.do(("employee", column.key, value), load)
+
+
+async def _invalidate_employee(employee: RowMapping) -> None:
+    """Сбрасывает кэш и идущие загрузки сотрудника после изменения"""
+    lookup_flights.forget(
+        ("employee", "id", employee["id"]), ("employee", "id_telegram", employee["id_telegram"])
+    )
+    await lookup_cache.invalidate(employee_telegram_key(employee["id_telegram"]))
+
+
+async def _update_employee(
+    session: AsyncSession,
+    where: ColumnElement[bool],
+    employee_update: EmployeeUpdateSchema,
+    if_match: str | None,
+):
+    """Обновляет сотрудника одним UPDATE ... RETURNING, если его версия совпадает с If-Match"""
+    versions = if_match_versions(if_match)
+    condition = where if versions is None else and_(where, EmployeeModel.change_seq.in_(versions))
+    employee = await employees_repository.update(
+        session, condition, employee_update.model_dump(exclude_unset=True)
+    )
+    if not employee:
+        if versions is not None and await employees_repository.get(session, where, [EmployeeModel.id]):
+            raise HTTPException(status_code=412, detail="Employee was modified")
+        raise HTTPException(status_code=404, detail="Employee not found")
+    await session.commit()
+    await _invalidate_employee(employee)
+    return json_response(
+        {"status": "success", "message": "Employee updated"},
+        headers={"ETag": record_etag(employee["change_seq"])},
+    )
+
+
+async def _delete_employee(session: AsyncSession, where: ColumnElement[bool]):
+    """Удаляет сотрудника одним DELETE ... RETURNING"""
+    employee = await employees_repository.delete(session, where)
+    if not employee:
+        raise HTTPException(status_code=404, detail="Employee not found")
+    await session.commit()
+    await _invalidate_employee(employee)
+    return {"status": "success", "message": "Employee deleted"}
+
+
+def _filter_employees(
+    query: Select,
+    department: str | None,
+    organisation: str | None,
+    is_working: bool | None,
+) -> Select:
+    """Добавляет к запросу необязательные фильтры списка сотрудников"""
+    if department is not None:
+        query = query.where(EmployeeModel.department == department)
+    if organisation is not None:
+        query = query.where(EmployeeModel.organisation == organisation)
+    if is_working is not None:
+        query = query.where(EmployeeModel.is_working == is_working)
+    return query
+
+
 @router.post("/", summary="Создание нового сотрудника")
 async def create_employee(employee: EmployeeCreateSchema, session: SessionDep):
     """Создает нового сотрудника в БД"""
-    new_employee = EmployeeModel(**employee.model_dump())
-    session.add(new_employee)
+    employee_id = await employees_repository.create(session, employee.model_dump())
     await session.commit()
-    await session.refresh(new_employee)
+    await lookup_cache.invalidate(employee_telegram_key(employee.id_telegram))
     return {
         "status": "success",
         "message": "Employee created",
-        "employee_id": new_employee.id,
+        "employee_id": employee_id,
     }
 
 
-@router.get("/", response_model=list[EmployeeSchema], summary="Получение списка всех сотрудников")
-async def get_employees(session: SessionDep) -> list[EmployeeSchema]:
-    """Возвращает список всех сотрудников"""
-    query = select(EmployeeModel)
+@router.post("/bulk", response_model=EmployeeBulkResultSchema, summary="Пакетная синхронизация сотрудников")
+async def bulk_upsert_employees(
+    employees: Annotated[list[EmployeeCreateSchema], Body(max_length=settings.bulk_max_rows)],
+    session: SessionDep,
+) -> EmployeeBulkResultSchema:
+    """Создает или обновляет сотрудников по ZUP ID пачками в одной транзакции"""
+    result = await upsert_employees(
+        session,
+        [employee.model_dump() for employee in employees],
+        settings.bulk_chunk_size,
+    )
+    # Синхронизация может сменить Telegram ID у сотрудника, поэтому сбрасываем все записи
+    await lookup_cache.invalidate_prefix(EMPLOYEE_KEY_PREFIX)
+    return EmployeeBulkResultSchema(
+        created=result.created,
+        updated=result.updated,
+        unchanged=result.unchanged,
+        failed=len(result.errors),
+        errors=[{"zup_id": zup_id, "detail": detail} for zup_id, detail in result.errors],
+        skipped_duplicates=result.skipped_duplicates,
+    )
+
+
+@router.get("/", response_model=PageSchema[EmployeeSchema], summary="Получение списка сотрудников")
+async def get_employees(
+    session: ReadSessionDep,
+    encoding: NegotiatedDep,
+    limit: Annotated[int, Query(ge=1, le=settings.page_max_limit)] = settings.page_default_limit,
+    cursor: str | None = None,
+    department: str | None = None,
+    organisation: str | None = None,
+    is_working: bool | None = None,
+    if_none_match: Annotated[str | None, Header()] = None,
+) -> PageSchema[EmployeeSchema]:
+    """Возвращает страницу сотрудников с keyset-пагинацией по id"""
+    query = select(*EMPLOYEE_RECORD_COLUMNS).order_by(EmployeeModel.id).limit(limit + 1)
+    if cursor is not None:
+        query = query.where(EmployeeModel.id > decode_cursor(cursor, id=int)["id"])
+    query = _filter_employees(query, department, organisation, is_working)
+
+    # Колонки читаются кортежами и кодируются orjson без ORM-объектов и повторной валидации
     result = await session.execute(query)
-    return result.scalars().all()
+    rows = result.all()
+    next_cursor = encode_cursor(id=rows[limit - 1].id) if len(rows) > limit else None
+    etag = page_etag((row.change_seq for row in rows[:limit]), next_cursor)
+    if none_match(if_none_match, etag):
+        return not_modified(etag)
+    return encoding.response(
+        {"items": rows_to_dicts(EMPLOYEE_FIELDS, rows[:limit]), "next_cursor": next_cursor},
+        headers={"ETag": etag},
+    )
+
+
+@router.get("/export", summary="Потоковая выгрузка сотрудников")
+async def export_employees(
+    encoding: NegotiatedDep,
+    export_format: Annotated[ExportFormat | None, Query(alias="format")] = None,
+    department: str | None = None,
+    organisation: str | None = None,
+    is_working: bool | None = None,
+):
+    """Выгружает сотрудников в NDJSON, CSV или msgpack из согласованного снимка БД"""
+    query = select(*EMPLOYEE_COLUMNS).order_by(EmployeeModel.id)
+    query = _filter_employees(query, department, organisation, is_working)
+    return await export_response(query, EMPLOYEE_FIELDS, export_format, "employees", encoding)
+
+
+@router.get("/search", response_model=PageSchema[EmployeeSchema], summary="Поиск сотрудников")
+async def search_employees(
+    session: ReadSessionDep,
+    encoding: NegotiatedDep,
+    q: Annotated[str, Query(min_length=2, max_length=100)],
+    limit: Annotated[int, Query(ge=1, le=settings.page_max_limit)] = settings.page_default_limit,
+    cursor: str | None = None,
+) -> PageSchema[EmployeeSchema]:
+    """Ищет сотрудников по ФИО, логину, должности и подразделению, лучшие совпадения первыми"""
+    after = None
+    if cursor is not None:
+        position = decode_cursor(cursor, distance=float, id=int)
+        after = (position["distance"], position["id"])
+
+    result = await session.execute(search_employees_query(EMPLOYEE_COLUMNS, q, limit, after))
+    rows = result.all()
+    next_cursor = (
+        encode_cursor(distance=rows[limit - 1].distance, id=rows[limit - 1].id) if len(rows) > limit else None
+    )
+    return encoding.response(
+        {"items": rows_to_dicts(EMPLOYEE_FIELDS, rows[:limit]), "next_cursor": next_cursor}
+    )
+
+
+@router.get("/changes", response_model=ChangesPageSchema[EmployeeSchema], summary="Лента изменений сотрудников")
+async def get_employee_changes(
+    session: ReadSessionDep,
+    encoding: NegotiatedDep,
+    limit: Annotated[int, Query(ge=1, le=settings.page_max_limit)] = settings.page_default_limit,
+    since: str | None = None,
+) -> ChangesPageSchema[EmployeeSchema]:
+    """Возвращает изменения и удаления сотрудников после курсора для инкрементальной синхронизации"""
+    return await changes_response(session, EmployeeModel, EMPLOYEE_COLUMNS, since, limit, encoding)
 
 
 @router.get("/{employee_id}", response_model=EmployeeSchema, summary="Получение сотрудника по ID")
-async def get_employee(employee_id: int, session: SessionDep) -> EmployeeSchema:
-    """Возвращает сотрудника по ID"""
-    query = select(EmployeeModel).where(EmployeeModel.id == employee_id)
-    result = await session.execute(query)
-    employee = result.scalar_one_or_none()
+async def get_employee(
+    employee_id: int, if_none_match: Annotated[str | None, Header()] = None
+) -> EmployeeSchema:
+    """Возвращает сотрудника по ID или 304, если его версия у клиента актуальна"""
+    employee = await _load_employee(EmployeeModel.id, employee_id)
     if not employee:
         raise HTTPException(status_code=404, detail="Employee not found")
-    return employee
+    return record_response(employee, if_none_match)
 
 
 @router.get("/telegram/{id_telegram}", response_model=EmployeeSchema, summary="Получение сотрудника по Telegram ID")
-async def get_employee_by_telegram_id(id_telegram: int, session: SessionDep) -> EmployeeSchema:
-    """Возвращает сотрудника по Telegram ID"""
-    query = select(EmployeeModel).where(EmployeeModel.id_telegram == id_telegram)
-    result = await session.execute(query)
-    employee = result.scalar_one_or_none()
+async def get_employee_by_telegram_id(
+    id_telegram: int, if_none_match: Annotated[str | None, Header()] = None
+) -> EmployeeSchema:
+    """Возвращает сотрудника по Telegram ID или 304, если его версия у клиента актуальна"""
+    load = lambda: _load_employee(EmployeeModel.id_telegram, id_telegram)
+    employee = await (
+        load() if reads_pinned_to_primary() else lookup_cache.get_or_load(employee_telegram_key(id_telegram), load)
+    )
     if not employee:
         raise HTTPException(status_code=404, detail="Employee not found")
-    return employee
+    return record_response(employee, if_none_match)
 
 
-@router.patch("/{employee_id}", summary="Обновление сотрудника по ID")
-async def update_employee(employee_id: int, employee_update: EmployeeUpdateSchema, session: SessionDep):
-    """Обновляет данные сотрудника по ID"""
-    query = select(EmployeeModel).where(EmployeeModel.id == employee_id)
-    result = await session.execute(query)
-    employee = result.scalar_one_or_none()
-    if not employee:
-        raise HTTPException(status_code=404, detail="Employee not found")
+@router.post(
+    "/telegram:batch",
+    response_model=TelegramBatchSchema[EmployeeSchema],
+    summary="Пакетное получение сотрудников по Telegram ID",
+)
+async def get_employees_by_telegram_ids(
+    ids: Annotated[list[int], Body(embed=True, min_length=1, max_length=settings.batch_max_size)],
+    session: ReadSessionDep,
+    encoding: NegotiatedDep,
+) -> TelegramBatchSchema[EmployeeSchema]:
+    """Возвращает сотрудников по списку Telegram ID одним запросом"""
+    employees = await employees_repository.get_many(
+        session, EmployeeModel.id_telegram, list(set(ids)), EMPLOYEE_COLUMNS
+    )
+    found = {employee["id_telegram"]: dict(employee) for employee in employees}
+    missing = [id_telegram for id_telegram in dict.fromkeys(ids) if id_telegram not in found]
+    return encoding.response({"found": found, "missing": missing})
 
-    update_data = employee_update.model_dump(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(employee, field, value)
 
-    session.add(employee)
-    await session.commit()
-    return {"status": "success", "message": "Employee updated"}
+@router.patch("/{employee_id}", summary="Обновление сотрудника по ID")
+async def update_employee(
+    employee_id: int,
+    employee_update: EmployeeUpdateSchema,
+    session: SessionDep,
+    if_match: Annotated[str | None, Header()] = None,
+):
+    """Обновляет данные сотрудника по ID"""
+    return await _update_employee(session, EmployeeModel.id == employee_id, employee_update, if_match)
 
 
 @router.patch("/telegram/{id_telegram}", summary="Обновление сотрудника по Telegram ID")
-async def update_employee_by_telegram_id(id_telegram: int, employee_update: EmployeeUpdateSchema, session: SessionDep):
+async def update_employee_by_telegram_id(
+    id_telegram: int,
+    employee_update: EmployeeUpdateSchema,
+    session: SessionDep,
+    if_match: Annotated[str | None, Header()] = None,
+):
     """Обновляет данные сотрудника по Telegram ID"""
-    query = select(EmployeeModel).where(EmployeeModel.id_telegram == id_telegram)
-    result = await session.execute(query)
-    employee = result.scalar_one_or_none()
-    if not employee:
-        raise HTTPException(status_code=404, detail="Employee not found")
-
-    update_data = employee_update.model_dump(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(employee, field, value)
-
-    session.add(employee)
-    await session.commit()
-    return {"status": "success", "message": "Employee updated"}
+    return await _update_employee(
+        session, EmployeeModel.id_telegram == id_telegram, employee_update, if_match
+    )
 
 
 @router.delete("/{employee_id}", summary="Удаление сотрудника по ID")
 async def delete_employee(employee_id: int, session: SessionDep):
     """Удаляет сотрудника из БД по ID"""
-    query = select(EmployeeModel).where(EmployeeModel.id == employee_id)
-    result = await session.execute(query)
-    employee = result.scalar_one_or_none()
-    if not employee:
-        raise HTTPException(status_code=404, detail="Employee not found")
-    await session.delete(employee)
-    await session.commit()
-    return {"status": "success", "message": "Employee deleted"}
+    return await _delete_employee(session, EmployeeModel.id == employee_id)
 
 
 @router.delete("/telegram/{id_telegram}", summary="Удаление сотрудника по Telegram ID")
 async def delete_employee_by_telegram_id(id_telegram: int, session: SessionDep):
     """Удаляет сотрудника из БД по Telegram ID"""
-    query = select(EmployeeModel).where(EmployeeModel.id_telegram == id_telegram)
-    result = await session.execute(query)
-    employee = result.scalar_one_or_none()
-    if not employee:
-        raise HTTPException(status_code=404, detail="Employee not found")
-    await session.delete(employee)
-    await session.commit()
-    return {"status": "success", "message": "Employee deleted"}
\ No newline at end of file
+    return await _delete_employee(session, EmployeeModel.id_telegram == id_telegram)
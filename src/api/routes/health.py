@@ -0,0 +1,18 @@
+from fastapi import APIRouter, Request
+from fastapi.responses import JSONResponse
+
+router = APIRouter(prefix="/health", tags=["Состояние"])
+
+
+@router.get("/live", summary="Проверка жизнеспособности")
+async def liveness():
+    """Процесс запущен и обрабатывает запросы"""
+    return {"status": "alive"}
+
+
+@router.get("/ready", summary="Проверка готовности к трафику")
+async def readiness(request: Request):
+    """Готов ли воркер принимать трафик: пул соединений прогрет"""
+    if not getattr(request.app.state, "ready", False):
+        return JSONResponse(status_code=503, content={"status": "warming_up"})
+    return {"status": "ready"}
@@ -0,0 +1,90 @@
+from typing import Annotated
+
+from fastapi import APIRouter, HTTPException, Query
+from sqlalchemy import Select, func, select, true
+
+from ...config import settings
+from ...database import EmployeeModel, OrgUnitClosureModel, OrgUnitModel
+from ...schemas import EmployeeSchema, OrgUnitSchema, PageSchema
+from ..dependencies import ReadSessionDep
+from ..pagination import decode_cursor, encode_cursor
+from ..responses import json_response, rows_to_dicts
+from .employees import EMPLOYEE_COLUMNS, EMPLOYEE_FIELDS
+
+ORG_UNIT_FIELDS = list(OrgUnitSchema.model_fields)
+
+router = APIRouter(prefix="/org", tags=["Оргструктура"])
+
+
+def _units_with_counts() -> Select:
+    """Узлы с численностью поддерева: по индексу замыкания и ix_employees_org_unit_id"""
+    counts = (
+        select(
+            func.count().label("headcount"),
+            func.count().filter(EmployeeModel.is_working).label("working"),
+        )
+        .select_from(OrgUnitClosureModel)
+        .join(EmployeeModel, EmployeeModel.org_unit_id == OrgUnitClosureModel.descendant_id)
+        .where(OrgUnitClosureModel.ancestor_id == OrgUnitModel.id)
+        .lateral("counts")
+    )
+    return select(
+        OrgUnitModel.id,
+        OrgUnitModel.parent_id,
+        OrgUnitModel.name,
+        OrgUnitModel.path,
+        OrgUnitModel.depth,
+        counts.c.headcount,
+        counts.c.working,
+    ).join(counts, true())
+
+
+@router.get("/units", response_model=list[OrgUnitSchema], summary="Дочерние узлы оргструктуры")
+async def get_org_units(session: ReadSessionDep, parent_id: int | None = None) -> list[OrgUnitSchema]:
+    """Возвращает дочерние узлы (без parent_id — корневые) с численностью их поддеревьев"""
+    parent = OrgUnitModel.parent_id.is_(None) if parent_id is None else OrgUnitModel.parent_id == parent_id
+    result = await session.execute(_units_with_counts().where(parent).order_by(OrgUnitModel.name))
+    return json_response(rows_to_dicts(ORG_UNIT_FIELDS, result.all()))
+
+
+@router.get("/units/{unit_id}", response_model=OrgUnitSchema, summary="Узел оргструктуры")
+async def get_org_unit(unit_id: int, session: ReadSessionDep) -> OrgUnitSchema:
+    """Возвращает узел оргструктуры с численностью его поддерева"""
+    result = await session.execute(_units_with_counts().where(OrgUnitModel.id == unit_id))
+    unit = result.one_or_none()
+    if unit is None:
+        raise HTTPException(status_code=404, detail="Org unit not found")
+    return json_response(dict(zip(ORG_UNIT_FIELDS, unit)))
+
+
+@router.get(
+    "/units/{unit_id}/employees",
+    response_model=PageSchema[EmployeeSchema],
+    summary="Сотрудники поддерева оргструктуры",
+)
+async def get_org_unit_employees(
+    unit_id: int,
+    session: ReadSessionDep,
+    limit: Annotated[int, Query(ge=1, le=settings.page_max_limit)] = settings.page_default_limit,
+    cursor: str | None = None,
+    is_working: bool | None = None,
+) -> PageSchema[EmployeeSchema]:
+    """Возвращает страницу сотрудников узла и всех вложенных узлов с keyset-пагинацией по id"""
+    subtree = select(OrgUnitClosureModel.descendant_id).where(OrgUnitClosureModel.ancestor_id == unit_id)
+    query = (
+        select(*EMPLOYEE_COLUMNS)
+        .where(EmployeeModel.org_unit_id.in_(subtree))
+        .order_by(EmployeeModel.id)
+        .limit(limit + 1)
+    )
+    if cursor is not None:
+        query = query.where(EmployeeModel.id > decode_cursor(cursor, id=int)["id"])
+    if is_working is not None:
+        query = query.where(EmployeeModel.is_working == is_working)
+
+    result = await session.execute(query)
+    rows = result.all()
+    next_cursor = encode_cursor(id=rows[limit - 1].id) if len(rows) > limit else None
+    return json_response(
+        {"items": rows_to_dicts(EMPLOYEE_FIELDS, rows[:limit]), "next_cursor": next_cursor}
+    )
@@ -0,0 +1,76 @@
+from typing import Annotated
+
+from fastapi import APIRouter, Body, HTTPException, Query
+from sqlalchemy import select
+from sqlalchemy.orm import joinedload, selectinload
+
+from ...config import settings
+from ...database import UserModel, any_of
+from ...schemas import PageSchema, ProfileSchema, TelegramBatchSchema
+from ..dependencies import ReadSessionDep
+from ..pagination import decode_cursor, encode_cursor
+
+router = APIRouter(prefix="/profiles", tags=["Профили"])
+
+
+def _profile(user: UserModel) -> dict:
+    """Собирает профиль из пользователя с уже загруженным сотрудником"""
+    return {"user": user, "employee": user.employee}
+
+
+@router.get("/", response_model=PageSchema[ProfileSchema], summary="Получение списка профилей")
+async def get_profiles(
+    session: ReadSessionDep,
+    limit: Annotated[int, Query(ge=1, le=settings.page_max_limit)] = settings.page_default_limit,
+    cursor: str | None = None,
+) -> PageSchema[ProfileSchema]:
+    """Возвращает страницу профилей: сотрудники страницы подгружаются одним запросом"""
+    query = (
+        select(UserModel)
+        .options(selectinload(UserModel.employee))
+        .order_by(UserModel.id)
+        .limit(limit + 1)
+    )
+    if cursor is not None:
+        query = query.where(UserModel.id > decode_cursor(cursor, id=int)["id"])
+
+    result = await session.execute(query)
+    users = result.scalars().all()
+    next_cursor = encode_cursor(id=users[limit - 1].id) if len(users) > limit else None
+    return {"items": [_profile(user) for user in users[:limit]], "next_cursor": next_cursor}
+
+
+@router.post(
+    "/telegram:batch",
+    response_model=TelegramBatchSchema[ProfileSchema],
+    summary="Пакетное получение профилей по Telegram ID",
+)
+async def get_profiles_by_telegram_ids(
+    ids: Annotated[list[int], Body(embed=True, min_length=1, max_length=settings.batch_max_size)],
+    session: ReadSessionDep,
+) -> TelegramBatchSchema[ProfileSchema]:
+    """Возвращает профили по списку Telegram ID без N+1 запросов"""
+    query = (
+        select(UserModel)
+        .options(selectinload(UserModel.employee))
+        .where(any_of(UserModel.id_telegram, list(set(ids))))
+    )
+    result = await session.execute(query)
+    found = {user.id_telegram: _profile(user) for user in result.scalars()}
+    missing = [id_telegram for id_telegram in dict.fromkeys(ids) if id_telegram not in found]
+    return {"found": found, "missing": missing}
+
+
+@router.get("/telegram/{id_telegram}", response_model=ProfileSchema, summary="Получение профиля по Telegram ID")
+async def get_profile_by_telegram_id(id_telegram: int, session: ReadSessionDep) -> ProfileSchema:
+    """Возвращает пользователя и сотрудника одним запросом с JOIN"""
+    query = (
+        select(UserModel)
+        .options(joinedload(UserModel.employee))
+        .where(UserModel.id_telegram == id_telegram)
+    )
+    result = await session.execute(query)
+    user = result.scalar_one_or_none()
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    return _profile(user)
@@ -1,126 +1,246 @@
-from fastapi import APIRouter, HTTPException
-from sqlalchemy import select
-
-from ...database import UserModel
-from ...schemas import UserCreateSchema, UserSchema, UserUpdateSchema
-from ..dependencies import SessionDep
+from typing import Annotated
+
+from fastapi import APIRouter, Body, Header, HTTPException, Query
+from sqlalchemy import ColumnElement, RowMapping, and_, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
+
+from ...config import settings
+from ...core.admission import read_admission, write_admission
+from ...core.cache import employee_telegram_key, lookup_cache, user_telegram_key
+from ...core.singleflight import lookup_flights
+from ...database import (
+    AsyncSessionLocal,
+    DuplicateUserError,
+    UserModel,
+    read_session,
+    reads_pinned_to_primary,
+    user_create_batcher,
+    users_repository,
+)
+from ...schemas import (
+    ChangesPageSchema,
+    PageSchema,
+    TelegramBatchSchema,
+    UserCreateSchema,
+    UserSchema,
+    UserUpdateSchema,
+)
+from ..changes import changes_response
+from ..conditional import if_match_versions, none_match, not_modified, page_etag, record_etag, record_response
+from ..dependencies import ReadSessionDep, SessionDep
+from ..encoding import NegotiatedDep
+from ..export import ExportFormat, export_response
+from ..pagination import decode_cursor, encode_cursor
+from ..responses import json_response, rows_to_dicts, schema_columns
+
+USER_COLUMNS = schema_columns(UserModel, UserSchema)
+USER_FIELDS = list(UserSchema.model_fields)
+# Колонки записи с версией для ETag
+USER_RECORD_COLUMNS = [*USER_COLUMNS, UserModel.__table__.c.change_seq]
 
 router = APIRouter(prefix="/users", tags=["Пользователи"])
 
+
+async def _load_user(column: InstrumentedAttribute, value: int) -> dict | None:
+    """Загружает {"version", "data"} пользователя в отдельной сессии, общей для объединенных запросов"""
+    async def load() -> dict | None:
+        async with read_admission.slot(), read_session() as session:
+            user = await users_repository.get(session, column == value, USER_RECORD_COLUMNS)
+            if not user:
+                return None
+            data = UserSchema.model_validate({field: user[field] for field in USER_FIELDS}).model_dump(mode="json")
+            return {"version": user["change_seq"], "data": data}
+
+    if reads_pinned_to_primary():
+        # Клиент только что писал: не берем результат чужой загрузки, возможно, с реплики
+        return await load()
+    return await lookup_flights.do(("user", column.key, value), load)
+
+
+async def _invalidate_user(user: RowMapping, cascade: bool = False) -> None:
+    """Сбрасывает кэш и идущие загрузки пользователя после изменения"""
+    keys = [user_telegram_key(user["id_telegram"])]
+    lookup_flights.forget(("user", "id", user["id"]), ("user", "id_telegram", user["id_telegram"]))
+    if cascade:
+        # Удаление пользователя каскадно удаляет и сотрудника
+        keys.append(employee_telegram_key(user["id_telegram"]))
+        lookup_flights.forget(("employee", "id_telegram", user["id_telegram"]))
+    await lookup_cache.invalidate(*keys)
+
+
+async def _update_user(
+    session: AsyncSession, where: ColumnElement[bool], user_update: UserUpdateSchema, if_match: str | None
+):
+    """Обновляет пользователя одним UPDATE ... RETURNING, если его версия совпадает с If-Match"""
+    versions = if_match_versions(if_match)
+    condition = where if versions is None else and_(where, UserModel.change_seq.in_(versions))
+    user = await users_repository.update(session, condition, user_update.model_dump(exclude_none=True))
+    if not user:
+        if versions is not None and await users_repository.get(session, where, [UserModel.id]):
+            raise HTTPException(status_code=412, detail="User was modified")
+        raise HTTPException(status_code=404, detail="User not found")
+    await session.commit()
+    await _invalidate_user(user)
+    return json_response(
+        {"status": "success", "message": "User updated"}, headers={"ETag": record_etag(user["change_seq"])}
+    )
+
+
+async def _delete_user(session: AsyncSession, where: ColumnElement[bool]):
+    """Удаляет пользователя одним DELETE ... RETURNING"""
+    user = await users_repository.delete(session, where)
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    await session.commit()
+    await _invalidate_user(user, cascade=True)
+    return {"status": "success", "message": "User deleted"}
+
+
 # USERS ROUTES
 @router.post("/", summary="Создание нового пользователя")
-async def create_user(user: UserCreateSchema, session: SessionDep):
+async def create_user(user: UserCreateSchema):
     """Создает нового пользователя в БД"""
-    new_user = UserModel(
-        id_telegram=user.id_telegram,
-        username=user.username,
-        first_name=user.first_name,
-        last_name=user.last_name,
-    )
-    session.add(new_user)
-    await session.commit()
-    await session.refresh(new_user)
+    try:
+        if user_create_batcher is not None:
+            # Одновременные создания уходят в БД одной пачкой с общим COMMIT. Бюджет записей
+            # не занимается: иначе он ограничил бы размер пачки, а соединений нужно по одному на пачку
+            user_id = await user_create_batcher.create(user.model_dump())
+        else:
+            async with write_admission.slot(), AsyncSessionLocal() as session:
+                try:
+                    user_id = await users_repository.create(session, user.model_dump())
+                    await session.commit()
+                except IntegrityError as e:
+                    duplicate = DuplicateUserError.from_integrity_error(e)
+                    if duplicate is None:
+                        raise
+                    raise duplicate from e
+    except DuplicateUserError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    await lookup_cache.invalidate(user_telegram_key(user.id_telegram))
     return {
         "status": "success",
         "message": "User created",
-        "user_id": new_user.id,
+        "user_id": user_id,
     }
 
 
-@router.get("/", response_model=list[UserSchema], summary="Получение списка всех пользователей")
-async def get_users(session: SessionDep) -> list[UserSchema]:
-    """Возвращает список всех пользователей"""
-    query = select(UserModel)
+@router.get("/", response_model=PageSchema[UserSchema], summary="Получение списка пользователей")
+async def get_users(
+    session: ReadSessionDep,
+    encoding: NegotiatedDep,
+    limit: Annotated[int, Query(ge=1, le=settings.page_max_limit)] = settings.page_default_limit,
+    cursor: str | None = None,
+    if_none_match: Annotated[str | None, Header()] = None,
+) -> PageSchema[UserSchema]:
+    """Возвращает страницу пользователей с keyset-пагинацией по id"""
+    query = select(*USER_RECORD_COLUMNS).order_by(UserModel.id).limit(limit + 1)
+    if cursor is not None:
+        query = query.where(UserModel.id > decode_cursor(cursor, id=int)["id"])
+
+    # Колонки читаются кортежами и кодируются orjson без ORM-объектов и повторной валидации
     result = await session.execute(query)
-    return result.scalars().all()
+    rows = result.all()
+    next_cursor = encode_cursor(id=rows[limit - 1].id) if len(rows) > limit else None
+    etag = page_etag((row.change_seq for row in rows[:limit]), next_cursor)
+    if none_match(if_none_match, etag):
+        return not_modified(etag)
+    return encoding.response(
+        {"items": rows_to_dicts(USER_FIELDS, rows[:limit]), "next_cursor": next_cursor},
+        headers={"ETag": etag},
+    )
+
+
+@router.get("/export", summary="Потоковая выгрузка пользователей")
+async def export_users(
+    encoding: NegotiatedDep,
+    export_format: Annotated[ExportFormat | None, Query(alias="format")] = None,
+):
+    """Выгружает пользователей в NDJSON, CSV или msgpack из согласованного снимка БД"""
+    query = select(*USER_COLUMNS).order_by(UserModel.id)
+    return await export_response(query, USER_FIELDS, export_format, "users", encoding)
+
+
+@router.get("/changes", response_model=ChangesPageSchema[UserSchema], summary="Лента изменений пользователей")
+async def get_user_changes(
+    session: ReadSessionDep,
+    encoding: NegotiatedDep,
+    limit: Annotated[int, Query(ge=1, le=settings.page_max_limit)] = settings.page_default_limit,
+    since: str | None = None,
+) -> ChangesPageSchema[UserSchema]:
+    """Возвращает изменения и удаления пользователей после курсора для инкрементальной синхронизации"""
+    return await changes_response(session, UserModel, USER_COLUMNS, since, limit, encoding)
 
 
 @router.get("/{user_id}", response_model=UserSchema, summary="Получение пользователя по ID")
-async def get_user(user_id: int, session: SessionDep) -> UserSchema:
-    """Возвращает пользователя по ID"""
-    query = select(UserModel).where(UserModel.id == user_id)
-    result = await session.execute(query)
-    user = result.scalar_one_or_none()
+async def get_user(user_id: int, if_none_match: Annotated[str | None, Header()] = None) -> UserSchema:
+    """Возвращает пользователя по ID или 304, если его версия у клиента актуальна"""
+    user = await _load_user(UserModel.id, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
-    return user
+    return record_response(user, if_none_match)
 
 @router.delete("/{user_id}", summary="Удаление пользователя")
 async def delete_user(user_id: int, session: SessionDep):
     """Удаляет пользователя из БД"""
-    query = select(UserModel).where(UserModel.id == user_id)
-    result = await session.execute(query)
-    user = result.scalar_one_or_none()
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-    await session.delete(user)
-    await session.commit()
-    return {"status": "success", "message": "User deleted"}
+    return await _delete_user(session, UserModel.id == user_id)
 
 @router.patch("/{user_id}", summary="Обновление пользователя")
-async def update_user(user_id: int, user_update: UserUpdateSchema, session: SessionDep):
+async def update_user(
+    user_id: int,
+    user_update: UserUpdateSchema,
+    session: SessionDep,
+    if_match: Annotated[str | None, Header()] = None,
+):
     """Обновляет данные пользователя"""
-    query = select(UserModel).where(UserModel.id == user_id)
-    result = await session.execute(query)
-    user = result.scalar_one_or_none()
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-
-    if user_update.username is not None:
-        user.username = user_update.username
-    if user_update.first_name is not None:
-        user.first_name = user_update.first_name
-    if user_update.last_name is not None:
-        user.last_name = user_update.last_name
-    if user_update.phone_number is not None:
-        user.phone_number = user_update.phone_number
-
-    session.add(user)
-    await session.commit()
-    return {"status": "success", "message": "User updated"}
+    return await _update_user(session, UserModel.id == user_id, user_update, if_match)
 
 
 # TELEGRAM USERS ROUTES
 @router.get("/telegram/{id_telegram}", response_model=UserSchema, summary="Получение пользователя по Telegram ID")
-async def get_user_by_telegram_id(id_telegram: int, session: SessionDep) -> UserSchema:
-    """Возвращает пользователя по telegram ID"""
-    query = select(UserModel).where(UserModel.id_telegram == id_telegram)
-    result = await session.execute(query)
-    user = result.scalar_one_or_none()
+async def get_user_by_telegram_id(
+    id_telegram: int, if_none_match: Annotated[str | None, Header()] = None
+) -> UserSchema:
+    """Возвращает пользователя по telegram ID или 304, если его версия у клиента актуальна"""
+    load = lambda: _load_user(UserModel.id_telegram, id_telegram)
+    user = await (
+        load() if reads_pinned_to_primary() else lookup_cache.get_or_load(user_telegram_key(id_telegram), load)
+    )
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
-    return user
+    return record_response(user, if_none_match)
+
+@router.post(
+    "/telegram:batch",
+    response_model=TelegramBatchSchema[UserSchema],
+    summary="Пакетное получение пользователей по Telegram ID",
+)
+async def get_users_by_telegram_ids(
+    ids: Annotated[list[int], Body(embed=True, min_length=1, max_length=settings.batch_max_size)],
+    session: ReadSessionDep,
+    encoding: NegotiatedDep,
+) -> TelegramBatchSchema[UserSchema]:
+    """Возвращает пользователей по списку Telegram ID одним запросом"""
+    users = await users_repository.get_many(
+        session, UserModel.id_telegram, list(set(ids)), USER_COLUMNS
+    )
+    found = {user["id_telegram"]: dict(user) for user in users}
+    missing = [id_telegram for id_telegram in dict.fromkeys(ids) if id_telegram not in found]
+    return encoding.response({"found": found, "missing": missing})
 
 @router.delete("/telegram/{id_telegram}", summary="Удаление пользователя по Telegram ID")
 async def delete_user_by_telegram_id(id_telegram: int, session: SessionDep):
     """Удаляет пользователя по Telegram ID"""
-    query = select(UserModel).where(UserModel.id_telegram == id_telegram)
-    result = await session.execute(query)
-    user = result.scalar_one_or_none()
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-    await session.delete(user)
-    await session.commit()
-    return {"status": "success", "message": "User deleted"}
+    return await _delete_user(session, UserModel.id_telegram == id_telegram)
 
 @router.patch("/telegram/{id_telegram}", summary="Обновление пользователя по Telegram ID")
-async def update_user_by_telegram_id(id_telegram: int, user_update: UserUpdateSchema, session: SessionDep):
+async def update_user_by_telegram_id(
+    id_telegram: int,
+    user_update: UserUpdateSchema,
+    session: SessionDep,
+    if_match: Annotated[str | None, Header()] = None,
+):
     """Обновляет данные пользователя по Telegram ID"""
-    query = select(UserModel).where(UserModel.id_telegram == id_telegram)
-    result = await session.execute(query)
-    user = result.scalar_one_or_none()
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-
-    if user_update.username is not None and user.username != user_update.username:
-        user.username = user_update.username
-    if user_update.first_name is not None and user.first_name != user_update.first_name:
-        user.first_name = user_update.first_name
-    if user_update.last_name is not None and user.last_name != user_update.last_name:
-        user.last_name = user_update.last_name
-    if user_update.phone_number is not None and user.phone_number != user_update.phone_number:
-        user.phone_number = user_update.phone_number
-
-    session.add(user)
-    await session.commit()
-    return {"status": "success", "message": "User updated"}
\ No newline at end of file
+    return await _update_user(session, UserModel.id_telegram == id_telegram, user_update, if_match)
\ No newline at end of file
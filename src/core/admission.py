@@ -0,0 +1,105 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from fastapi import HTTPException
+
+from ..config import settings
+
+
+class Slot:
+    """Занятое место в бюджете; повторное освобождение ничего не делает"""
+
+    def __init__(self, gate: "AdmissionGate"):
+        self._gate = gate
+        self._released = False
+
+    def release(self) -> None:
+        if not self._released:
+            self._released = True
+            self._gate._release()
+
+
+class AdmissionGate:
+    """Ограничивает число одновременных запросов класса к БД
+
+    Запрос ждет свободное место не дольше `timeout` секунд, а при очереди
+    длиннее `max_queue` отклоняется сразу. Отказ — 503 с Retry-After, чтобы
+    клиент не ждал полный таймаут пула соединений и не повторял запрос тут же.
+    """
+
+    def __init__(self, name: str, limit: int, timeout: float, max_queue: int, retry_after: int):
+        self.name = name
+        self.limit = limit
+        self.timeout = timeout
+        self.max_queue = max_queue
+        self.retry_after = retry_after
+        self._semaphore = asyncio.Semaphore(limit)
+        self.in_flight = 0
+        self.queued = 0
+        self.admitted = 0
+        self.shed = 0
+
+    def _reject(self) -> HTTPException:
+        self.shed += 1
+        return HTTPException(
+            status_code=503,
+            detail="Server is busy, retry later",
+            headers={"Retry-After": str(self.retry_after)},
+        )
+
+    async def acquire(self) -> Slot:
+        """Занимает место или отклоняет запрос с 503"""
+        if self._semaphore.locked():
+            if self.queued >= self.max_queue:
+                raise self._reject()
+            self.queued += 1
+            try:
+                async with asyncio.timeout(self.timeout):
+                    await self._semaphore.acquire()
+            except TimeoutError:
+                raise self._reject()
+            finally:
+                self.queued -= 1
+        else:
+            await self._semaphore.acquire()
+        self.in_flight += 1
+        self.admitted += 1
+        return Slot(self)
+
+    def _release(self) -> None:
+        self.in_flight -= 1
+        self._semaphore.release()
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """Держит место на время блока"""
+        slot = await self.acquire()
+        try:
+            yield
+        finally:
+            slot.release()
+
+    def stats(self) -> dict[str, int]:
+        """Лимит, занятые места, длина очереди и счетчики пропущенных и отклоненных"""
+        return {
+            "limit": self.limit,
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "admitted": self.admitted,
+            "shed": self.shed,
+        }
+
+
+def _gate(name: str, limit: int) -> AdmissionGate:
+    return AdmissionGate(
+        name,
+        limit,
+        settings.admission_timeout_seconds,
+        settings.admission_max_queue,
+        settings.admission_retry_after_seconds,
+    )
+
+
+read_admission = _gate("read", settings.read_admission_limit)
+write_admission = _gate("write", settings.write_admission_limit)
@@ -1,17 +1,40 @@
-from contextlib import asynccontextmanager
+import asyncio
+from contextlib import asynccontextmanager, suppress
 
 from fastapi import FastAPI
 
-from ..api.routes import admin_router, users_router, employees_router
-from ..database import engine
+from ..api.routes import (
+    admin_router,
+    users_router,
+    employees_router,
+    profiles_router,
+    health_router,
+    org_router,
+    analytics_router,
+)
+from ..config import settings
+from ..database import engine, replica_router, user_create_batcher
+from .consistency import ReadYourWritesMiddleware
+from .metrics import MetricsMiddleware
+from .warmup import warm_up
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Управление жизненным циклом приложения"""
-    # Startup
+    # Startup: прогрев идет в фоне, чтобы liveness отвечала сразу, а readiness — после прогрева
+    app.state.ready = not settings.warmup_enabled
+    warmup_task = asyncio.create_task(warm_up(app)) if settings.warmup_enabled else None
+    replica_router.start()
     yield
     # Shutdown
+    if warmup_task is not None:
+        warmup_task.cancel()
+        with suppress(asyncio.CancelledError):
+            await warmup_task
+    if user_create_batcher is not None:
+        await user_create_batcher.drain()
+    await replica_router.stop()
     await engine.dispose()
 
 
@@ -22,9 +45,16 @@ def create_app() -> FastAPI:
         lifespan=lifespan,
     )
 
+    app.add_middleware(ReadYourWritesMiddleware)
+    app.add_middleware(MetricsMiddleware)
+
     # Регистрация роутеров
+    app.include_router(health_router)
     app.include_router(admin_router)
     app.include_router(users_router)
     app.include_router(employees_router)
+    app.include_router(profiles_router)
+    app.include_router(org_router)
+    app.include_router(analytics_router)
 
     return app
\ No newline at end of file
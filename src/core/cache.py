@@ -0,0 +1,210 @@
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Protocol
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+class CacheBackend(Protocol):
+    """Общий для всех воркеров бэкенд кэша"""
+
+    async def get(self, key: str) -> bytes | None: ...
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None: ...
+
+    async def delete(self, *keys: str) -> None: ...
+
+    async def delete_prefix(self, prefix: str) -> None: ...
+
+
+class RedisCacheBackend:
+    """Бэкенд кэша на Redis (требует необязательную зависимость redis)"""
+
+    def __init__(self, url: str):
+        from redis.asyncio import Redis
+
+        self._redis = Redis.from_url(url)
+
+    async def get(self, key: str) -> bytes | None:
+        return await self._redis.get(key)
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        await self._redis.set(key, value, px=int(ttl * 1000))
+
+    async def delete(self, *keys: str) -> None:
+        await self._redis.unlink(*keys)
+
+    async def delete_prefix(self, prefix: str) -> None:
+        async for key in self._redis.scan_iter(match=f"{prefix}*", count=1000):
+            await self._redis.unlink(key)
+
+
+class LRUCache:
+    """Ограниченный по размеру LRU-кэш процесса со сроком жизни записей"""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self.evictions = 0
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Any:
+        entry = self._entries.get(key)
+        if entry is None:
+            return _MISSING
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return _MISSING
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def delete(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    def delete_prefix(self, prefix: str) -> None:
+        for key in [key for key in self._entries if key.startswith(prefix)]:
+            del self._entries[key]
+
+
+class LookupCache:
+    """Read-through кэш поиска записей: LRU процесса и необязательный общий бэкенд
+
+    Отсутствие записи (None) тоже кэшируется, но на более короткий срок.
+    С общим бэкендом LRU процесса не используется: инвалидация на одном воркере
+    сразу видна остальным, и они не отдают устаревшую запись и ее старый ETag.
+    """
+
+    def __init__(
+        self,
+        max_size: int,
+        ttl: float,
+        negative_ttl: float,
+        backend: CacheBackend | None = None,
+    ):
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.backend = backend
+        self.hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._local = LRUCache(max_size)
+        self._loads: dict[str, object] = {}
+
+    async def get_or_load(
+        self, key: str, loader: Callable[[], Awaitable[dict | None]]
+    ) -> dict | None:
+        """Возвращает значение из кэша или загружает и кэширует его"""
+        # LRU процесса нельзя инвалидировать с других воркеров, поэтому он работает только без бэкенда
+        if self.backend is None:
+            value = self._local.get(key)
+            if value is not _MISSING:
+                self.hits += 1
+                return value
+
+        token = self._loads[key] = object()
+        if self.backend is not None:
+            try:
+                raw = await self.backend.get(key)
+            except Exception as e:
+                logger.warning(f"Общий кэш недоступен: {e}")
+                raw = None
+            if raw is not None:
+                self.shared_hits += 1
+                value = json.loads(raw)
+                self._store_local(key, token, value)
+                return value
+
+        self.misses += 1
+        value = await loader()
+        # Запись, инвалидированная во время загрузки, не кэшируется устаревшей
+        if self._store_local(key, token, value) and self.backend is not None:
+            try:
+                await self.backend.set(key, json.dumps(value).encode(), self._ttl_for(value))
+            except Exception as e:
+                logger.warning(f"Общий кэш недоступен: {e}")
+        return value
+
+    async def invalidate(self, *keys: str) -> None:
+        """Удаляет записи по ключам"""
+        self.invalidations += len(keys)
+        for key in keys:
+            self._local.delete(key)
+            self._loads.pop(key, None)
+        if self.backend is not None and keys:
+            try:
+                await self.backend.delete(*keys)
+            except Exception as e:
+                logger.warning(f"Не удалось инвалидировать общий кэш: {e}")
+
+    async def invalidate_prefix(self, prefix: str) -> None:
+        """Удаляет все записи пространства ключей (например, после пакетной синхронизации)"""
+        self.invalidations += 1
+        self._local.delete_prefix(prefix)
+        for key in [key for key in self._loads if key.startswith(prefix)]:
+            del self._loads[key]
+        if self.backend is not None:
+            try:
+                await self.backend.delete_prefix(prefix)
+            except Exception as e:
+                logger.warning(f"Не удалось инвалидировать общий кэш: {e}")
+
+    def stats(self) -> dict[str, int]:
+        """Счетчики попаданий, промахов и вытеснений"""
+        return {
+            "size": len(self._local),
+            "max_size": self._local.max_size,
+            "hits": self.hits,
+            "shared_hits": self.shared_hits,
+            "misses": self.misses,
+            "evictions": self._local.evictions,
+            "invalidations": self.invalidations,
+        }
+
+    def _ttl_for(self, value: dict | None) -> float:
+        return self.ttl if value is not None else self.negative_ttl
+
+    def _store_local(self, key: str, token: object, value: dict | None) -> bool:
+        """Сохраняет значение, только если ключ не инвалидировали во время загрузки"""
+        if self._loads.get(key) is not token:
+            return False
+        del self._loads[key]
+        if self.backend is None:
+            self._local.set(key, value, self._ttl_for(value))
+        return True
+
+
+def user_telegram_key(id_telegram: int) -> str:
+    """Ключ кэша пользователя по Telegram ID"""
+    return f"user:telegram:{id_telegram}"
+
+
+def employee_telegram_key(id_telegram: int) -> str:
+    """Ключ кэша сотрудника по Telegram ID"""
+    return f"employee:telegram:{id_telegram}"
+
+
+EMPLOYEE_KEY_PREFIX = "employee:"
+
+lookup_cache = LookupCache(
+    max_size=settings.cache_max_size,
+    ttl=settings.cache_ttl_seconds,
+    negative_ttl=settings.cache_negative_ttl_seconds,
+    backend=RedisCacheBackend(settings.cache_redis_url) if settings.cache_redis_url else None,
+)
@@ -0,0 +1,48 @@
+import time
+
+from starlette.requests import HTTPConnection
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from ..config import settings
+from ..database import RoutingState, current_routing, replica_router
+
+PRIMARY_COOKIE = "primary_until"
+
+
+class ReadYourWritesMiddleware:
+    """ASGI-middleware: после записи клиент какое-то время читает с основной БД
+
+    Ответ на успешно закоммиченную запись ставит cookie со сроком окончания
+    окна; пока окно открыто, чтения клиента не уходят на реплики и не берутся
+    из кэша, поэтому он видит свои изменения независимо от отставания реплик.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        window = settings.read_your_writes_seconds
+        if scope["type"] != "http" or not replica_router.engines or window <= 0:
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            pinned_until = float(HTTPConnection(scope).cookies.get(PRIMARY_COOKIE, 0))
+        except ValueError:
+            pinned_until = 0.0
+        state = RoutingState(pinned=pinned_until > time.time())
+        token = current_routing.set(state)
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start" and state.committed and message["status"] < 400:
+                cookie = (
+                    f"{PRIMARY_COOKIE}={time.time() + window:.3f}; "
+                    f"Max-Age={max(int(window), 1)}; Path=/; HttpOnly; SameSite=Lax"
+                )
+                message["headers"] = [*message.get("headers", []), (b"set-cookie", cookie.encode())]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            current_routing.reset(token)
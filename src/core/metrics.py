@@ -0,0 +1,172 @@
+import bisect
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+BATCH_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Counter:
+    """Счетчик Prometheus с метками"""
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        for labels, value in sorted(self._values.items()):
+            lines.append(f"{self.name}{_format_labels(self.labelnames, labels)} {value}")
+        return lines
+
+
+class Histogram:
+    """Гистограмма Prometheus с фиксированными границами корзин"""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.buckets = buckets
+        # Для каждого набора меток: счетчики корзин (последняя — +Inf), сумма и количество
+        self._series: dict[tuple[str, ...], tuple[list[int], list[float]]] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = ([0] * (len(self.buckets) + 1), [0.0])
+        counts, total = series
+        counts[bisect.bisect_left(self.buckets, value)] += 1
+        total[0] += value
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        for labels, (counts, total) in sorted(self._series.items()):
+            cumulative = 0
+            for bound, count in zip((*self.buckets, "+Inf"), counts):
+                cumulative += count
+                le = f'le="{bound}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, labels)} {total[0]}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, labels)} {cumulative}")
+        return lines
+
+
+def render_gauges(name: str, documentation: str, values: dict[str, float]) -> list[str]:
+    """Отрисовывает набор мгновенных значений одной метрикой с меткой kind"""
+    lines = [f"# HELP {name} {documentation}", f"# TYPE {name} gauge"]
+    for kind, value in values.items():
+        lines.append(f'{name}{{kind="{_escape(kind)}"}} {value}')
+    return lines
+
+
+@dataclass
+class RequestStats:
+    """Работа с БД в рамках одного HTTP-запроса"""
+    queries: int = 0
+    db_time: float = 0.0
+    pool_wait: float = 0.0
+
+
+current_request: ContextVar[RequestStats | None] = ContextVar("current_request", default=None)
+
+http_requests = Counter(
+    "http_requests_total", "Количество HTTP-запросов", ("method", "route", "status")
+)
+http_request_duration = Histogram(
+    "http_request_duration_seconds", "Длительность HTTP-запросов", ("method", "route")
+)
+db_queries_per_request = Histogram(
+    "db_queries_per_request", "Количество запросов к БД на HTTP-запрос", ("method", "route"), COUNT_BUCKETS
+)
+db_time_per_request = Histogram(
+    "db_time_per_request_seconds", "Суммарное время запросов к БД на HTTP-запрос", ("method", "route")
+)
+db_query_duration = Histogram("db_query_duration_seconds", "Длительность запросов к БД")
+db_slow_queries = Counter("db_slow_queries_total", "Запросы к БД дольше порога медленного запроса")
+db_pool_checkout_wait = Histogram(
+    "db_pool_checkout_wait_seconds", "Ожидание соединения из пула"
+)
+user_create_batch_rows = Histogram(
+    "user_create_batch_rows", "Строк в пачке группового создания пользователей", buckets=BATCH_BUCKETS
+)
+
+
+class MetricsMiddleware:
+    """ASGI-middleware: задержка, статус и работа с БД по шаблону маршрута"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = current_request.set(stats)
+        status = 500
+        started = time.perf_counter()
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            current_request.reset(token)
+            # Метка — шаблон пути, а не сам путь, чтобы число рядов не зависело от ID
+            route = getattr(scope.get("route"), "path", "unmatched")
+            method = scope["method"]
+            http_requests.inc(method, route, str(status))
+            http_request_duration.observe(time.perf_counter() - started, method, route)
+            db_queries_per_request.observe(stats.queries, method, route)
+            db_time_per_request.observe(stats.db_time, method, route)
+
+
+def render_metrics(*extra_sections: list[str]) -> str:
+    """Текст всех метрик процесса в формате Prometheus"""
+    lines: list[str] = []
+    for metric in (
+        http_requests,
+        http_request_duration,
+        db_queries_per_request,
+        db_time_per_request,
+        db_query_duration,
+        db_slow_queries,
+        db_pool_checkout_wait,
+        user_create_batch_rows,
+    ):
+        lines.extend(metric.render())
+    for section in extra_sections:
+        lines.extend(section)
+    return "\n".join(lines) + "\n"
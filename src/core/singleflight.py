@@ -0,0 +1,53 @@
+import asyncio
+from typing import Awaitable, Callable, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Объединяет одновременные вызовы с одинаковым ключом в один
+
+    Первый вызов запускает загрузку отдельной задачей, остальные ждут ее
+    результат. Отмена ожидающего запроса не отменяет общую загрузку, поэтому
+    функция загрузки не должна зависеть от ресурсов конкретного запроса.
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.coalesced = 0
+        self._tasks: dict[Hashable, asyncio.Task] = {}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """Выполняет fn или присоединяется к уже идущему вызову с тем же ключом"""
+        self.calls += 1
+        task = self._tasks.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._tasks[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    def forget(self, *keys: Hashable) -> None:
+        """Отвязывает идущие вызовы от ключей: следующий вызов начнет новую загрузку"""
+        for key in keys:
+            self._tasks.pop(key, None)
+
+    def stats(self) -> dict[str, int]:
+        """Счетчики вызовов и объединенных запросов"""
+        return {
+            "calls": self.calls,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._tasks),
+        }
+
+    def _forget(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._tasks.get(key) is task:
+            del self._tasks[key]
+        # Исключение уже получили ожидающие вызовы, здесь лишь помечаем его обработанным
+        if not task.cancelled():
+            task.exception()
+
+
+lookup_flights = SingleFlight()
@@ -0,0 +1,89 @@
+import asyncio
+import logging
+
+from fastapi import FastAPI
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.exc import ProgrammingError
+
+from ..api.routes.employees import EMPLOYEE_COLUMNS, EMPLOYEE_RECORD_COLUMNS
+from ..api.routes.users import USER_COLUMNS, USER_RECORD_COLUMNS
+from ..config import settings
+from ..database import (
+    AsyncSessionLocal,
+    EmployeeModel,
+    UserModel,
+    employees_repository,
+    engine,
+    replica_router,
+    users_repository,
+)
+
+logger = logging.getLogger(__name__)
+
+# Заведомо отсутствующее значение: запросы выполняются, но строк не возвращают
+_MISSING_ID = -1
+
+
+async def _prime_connection(target: AsyncEngine, barrier: asyncio.Barrier) -> None:
+    """Открывает соединение и выполняет на нем горячие запросы в форме, как в маршрутах
+
+    Совпадение формы запросов важно: SQLAlchemy кэширует скомпилированные
+    операторы по их структуре, а asyncpg — подготовленные операторы по тексту SQL
+    в каждом соединении отдельно.
+    """
+    try:
+        async with target.connect() as conn:
+            async with AsyncSessionLocal(bind=conn) as session:
+                for repository, model, columns, record_columns in (
+                    (users_repository, UserModel, USER_COLUMNS, USER_RECORD_COLUMNS),
+                    (employees_repository, EmployeeModel, EMPLOYEE_COLUMNS, EMPLOYEE_RECORD_COLUMNS),
+                ):
+                    await repository.get(session, model.id == _MISSING_ID, record_columns)
+                    await repository.get(session, model.id_telegram == _MISSING_ID, record_columns)
+                    await repository.get_many(session, model.id_telegram, [_MISSING_ID], columns)
+                    await session.execute(
+                        select(*record_columns).order_by(model.id).limit(settings.page_default_limit + 1)
+                    )
+                await session.rollback()
+            # Соединения держатся до тех пор, пока не откроются все, иначе пул выдаст одно и то же
+            await barrier.wait()
+    except Exception:
+        # Остальные соединения не должны вечно ждать упавшее
+        barrier.abort()
+        raise
+
+
+async def _prime_engine(target: AsyncEngine, connections: int) -> None:
+    barrier = asyncio.Barrier(connections)
+    await asyncio.gather(*(_prime_connection(target, barrier) for _ in range(connections)))
+
+
+async def warm_up(app: FastAPI) -> None:
+    """Прогревает пул соединений и помечает приложение готовым к трафику
+
+    При недоступной БД прогрев повторяется, а readiness остается отрицательной.
+    """
+    connections = min(settings.warmup_connections or settings.pool_size, settings.pool_size)
+    while True:
+        try:
+            await _prime_engine(engine, connections)
+            break
+        except ProgrammingError as e:
+            # Таблиц еще нет (до /admin/init_db): не держим воркер неготовым из-за схемы
+            logger.warning(f"Прогрев запросов пропущен, схема БД не создана: {e}")
+            break
+        except Exception as e:
+            logger.warning(f"Прогрев не удался, повтор через {settings.warmup_retry_seconds} с: {e}")
+            await asyncio.sleep(settings.warmup_retry_seconds)
+
+    # Реплики прогреваются без повторов: недоступная реплика не должна держать воркер неготовым
+    results = await asyncio.gather(
+        *(_prime_engine(replica, connections) for replica in replica_router.engines), return_exceptions=True
+    )
+    for replica, result in zip(replica_router.engines, results):
+        if isinstance(result, Exception):
+            logger.warning(f"Прогрев реплики {replica.url.host}:{replica.url.port} не удался: {result}")
+
+    app.state.ready = True
+    logger.info(f"Прогрев завершен: открыто соединений {connections}")
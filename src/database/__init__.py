@@ -1,13 +1,62 @@
-from .models import Base, UserModel, EmployeeModel
-from .session import engine, AsyncSessionLocal, get_session
+from .models import (
+    Base,
+    UserModel,
+    EmployeeModel,
+    OrgUnitModel,
+    OrgUnitClosureModel,
+    HeadcountSummaryModel,
+    HireSummaryModel,
+    TombstoneModel,
+)
+from .session import (
+    engine,
+    replica_router,
+    AsyncSessionLocal,
+    read_session,
+    get_session,
+    get_read_session,
+)
+from .replicas import current_routing, reads_pinned_to_primary, RoutingState
 from .init_db import init_db
+from .bulk import BulkUpsertResult, upsert_employees
+from .batching import DuplicateUserError, UserCreateBatcher, user_create_batcher
+from .changes import ChangePage, fetch_changes
+from .search import SEARCH_INDEX, search_employees_query
+from . import org  # noqa: F401  триггеры оргструктуры регистрируются при импорте
+from .analytics import rebuild_summaries
+from .repository import Repository, any_of, employees_repository, users_repository
 
 __all__ = [
     "Base",
     "UserModel",
     "EmployeeModel",
+    "OrgUnitModel",
+    "OrgUnitClosureModel",
+    "HeadcountSummaryModel",
+    "HireSummaryModel",
+    "TombstoneModel",
     "engine",
+    "replica_router",
     "AsyncSessionLocal",
+    "read_session",
     "get_session",
+    "get_read_session",
+    "RoutingState",
+    "current_routing",
+    "reads_pinned_to_primary",
     "init_db",
-]
\ No newline at end of file
+    "BulkUpsertResult",
+    "upsert_employees",
+    "DuplicateUserError",
+    "UserCreateBatcher",
+    "user_create_batcher",
+    "ChangePage",
+    "fetch_changes",
+    "SEARCH_INDEX",
+    "search_employees_query",
+    "rebuild_summaries",
+    "Repository",
+    "any_of",
+    "users_repository",
+    "employees_repository",
+]
@@ -0,0 +1,97 @@
+from sqlalchemy import DDL, event, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .models import Base, EmployeeModel
+
+# Измерения сводок в том же порядке, что и колонки первичных ключей
+_HEADCOUNT_ROW = (
+    "organisation, department, position, is_working, date_of_end IS NOT NULL AS terminated"
+)
+_HIRE_ROW = "organisation, department, date_trunc('month', date_of_start)::date AS hire_month"
+
+# Триггеры уровня оператора с таблицами переходов: пачка из /employees/bulk или импорта
+# дает по одному UPSERT на затронутую группу, а не на каждую строку. ORDER BY задает
+# общий порядок блокировок строк сводки и исключает взаимные блокировки параллельных записей.
+_APPLY_DELTA = """
+    INSERT INTO headcount_summary AS s (organisation, department, position, is_working, terminated, employees)
+    SELECT organisation, department, position, is_working, terminated, sum(delta)
+    FROM ({headcount_rows}) AS d
+    GROUP BY 1, 2, 3, 4, 5 HAVING sum(delta) <> 0 ORDER BY 1, 2, 3, 4, 5
+    ON CONFLICT (organisation, department, position, is_working, terminated)
+    DO UPDATE SET employees = s.employees + EXCLUDED.employees;
+
+    INSERT INTO hire_summary AS s (organisation, department, hire_month, hires)
+    SELECT organisation, department, hire_month, sum(delta)
+    FROM ({hire_rows}) AS d
+    GROUP BY 1, 2, 3 HAVING sum(delta) <> 0 ORDER BY 1, 2, 3
+    ON CONFLICT (organisation, department, hire_month)
+    DO UPDATE SET hires = s.hires + EXCLUDED.hires;
+"""
+
+
+def _rows(row: str, operation: str) -> str:
+    added = f"SELECT {row}, 1 AS delta FROM new_rows"
+    removed = f"SELECT {row}, -1 AS delta FROM old_rows"
+    return {"insert": added, "delete": removed, "update": f"{added} UNION ALL {removed}"}[operation]
+
+
+for _operation, _transitions in (
+    ("insert", "NEW TABLE AS new_rows"),
+    ("update", "OLD TABLE AS old_rows NEW TABLE AS new_rows"),
+    ("delete", "OLD TABLE AS old_rows"),
+):
+    _body = _APPLY_DELTA.format(
+        headcount_rows=_rows(_HEADCOUNT_ROW, _operation), hire_rows=_rows(_HIRE_ROW, _operation)
+    )
+    event.listen(
+        Base.metadata,
+        "before_create",
+        DDL(
+            f"""
+            CREATE OR REPLACE FUNCTION employees_summary_on_{_operation}() RETURNS trigger AS $$
+            BEGIN
+                {_body}
+                RETURN NULL;
+            END
+            $$ LANGUAGE plpgsql
+            """
+        ),
+    )
+    event.listen(
+        EmployeeModel.__table__,
+        "after_create",
+        DDL(
+            f"CREATE TRIGGER employees_summary_{_operation} AFTER {_operation.upper()} ON employees "
+            f"REFERENCING {_transitions} FOR EACH STATEMENT "
+            f"EXECUTE FUNCTION employees_summary_on_{_operation}()"
+        ),
+    )
+
+_REBUILD_QUERIES = (
+    text("LOCK TABLE employees IN SHARE MODE"),
+    text("DELETE FROM headcount_summary"),
+    text("DELETE FROM hire_summary"),
+    text(
+        f"""
+        INSERT INTO headcount_summary (organisation, department, position, is_working, terminated, employees)
+        SELECT {_HEADCOUNT_ROW}, count(*) FROM employees GROUP BY 1, 2, 3, 4, 5
+        """
+    ),
+    text(
+        f"""
+        INSERT INTO hire_summary (organisation, department, hire_month, hires)
+        SELECT {_HIRE_ROW}, count(*) FROM employees GROUP BY 1, 2, 3
+        """
+    ),
+)
+
+
+async def rebuild_summaries(session: AsyncSession) -> None:
+    """Пересчитывает сводки с нуля по таблице employees и фиксирует транзакцию
+
+    Нужен для БД, созданных до появления сводок; на время пересчета записи
+    в employees ждут, чтения продолжаются.
+    """
+    for query in _REBUILD_QUERIES:
+        await session.execute(query)
+    await session.commit()
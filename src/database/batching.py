@@ -0,0 +1,182 @@
+import asyncio
+import logging
+from typing import Any
+
+from sqlalchemy import any_, bindparam, or_, select, text
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.dialects.postgresql import ARRAY
+
+from ..config import settings
+from ..core.metrics import user_create_batch_rows
+from .models import UserModel
+from .replicas import mark_committed
+from .session import AsyncSessionLocal
+
+logger = logging.getLogger(__name__)
+
+_COLUMNS = ("id_telegram", "username", "first_name", "last_name")
+_UNIQUE_COLUMNS = ("id_telegram", "username")
+UNIQUE_VIOLATION = "23505"
+
+# Текст не зависит от размера пачки: колонки передаются массивами, по одному параметру на колонку
+_INSERT_QUERY = text(
+    f"""
+    INSERT INTO users ({", ".join(_COLUMNS)})
+    SELECT * FROM unnest({", ".join(f":{column}" for column in _COLUMNS)})
+    ON CONFLICT DO NOTHING
+    RETURNING id, id_telegram
+    """
+).bindparams(
+    *(bindparam(column, type_=ARRAY(UserModel.__table__.c[column].type)) for column in _COLUMNS)
+)
+
+
+class DuplicateUserError(Exception):
+    """Пользователь с таким значением уникальной колонки уже существует"""
+
+    def __init__(self, field: str | None):
+        self.field = field
+        super().__init__(f"User with this {field} already exists" if field else "User already exists")
+
+    @classmethod
+    def from_integrity_error(cls, error: IntegrityError) -> "DuplicateUserError | None":
+        """Ошибка по нарушению уникальности из INSERT или None для прочих нарушений целостности"""
+        if getattr(error.orig, "sqlstate", None) != UNIQUE_VIOLATION:
+            return None
+        # Имя ограничения по умолчанию в PostgreSQL: users_<колонка>_key
+        constraint = getattr(error.orig.__cause__, "constraint_name", None) or ""
+        field = next((column for column in _UNIQUE_COLUMNS if constraint == f"users_{column}_key"), None)
+        return cls(field)
+
+
+class UserCreateBatcher:
+    """Собирает одновременные создания пользователей в пачки
+
+    Пачка уходит в БД одним INSERT ... SELECT FROM unnest(...) и одним COMMIT,
+    когда набирается `max_rows` строк или проходит `max_delay_ms` с первой строки.
+    Каждый вызывающий получает свой id или DuplicateUserError для своей строки.
+    """
+
+    def __init__(self, max_rows: int, max_delay_ms: float):
+        self.max_rows = max_rows
+        self.max_delay = max_delay_ms / 1000
+        self._pending: list[tuple[dict[str, Any], asyncio.Future]] = []
+        self._timer: asyncio.TimerHandle | None = None
+        self._flushes: set[asyncio.Task] = set()
+
+    async def create(self, values: dict[str, Any]) -> int:
+        """Ставит строку в очередь и ждет id, присвоенный ей при сбросе пачки"""
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((values, future))
+        if len(self._pending) >= self.max_rows:
+            self._flush_pending()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.max_delay, self._flush_pending)
+        user_id = await future
+        # COMMIT выполнялся в задаче сброса, а не в контексте этого запроса
+        mark_committed()
+        return user_id
+
+    def _flush_pending(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.create_task(self._flush(batch))
+            self._flushes.add(task)
+            task.add_done_callback(self._flushes.discard)
+
+    async def _flush(self, batch: list[tuple[dict[str, Any], asyncio.Future]]) -> None:
+        user_create_batch_rows.observe(len(batch))
+        # Повторы внутри пачки получают ошибку сразу, как если бы строки вставлялись по очереди
+        rows: list[tuple[dict[str, Any], asyncio.Future]] = []
+        seen: dict[str, set] = {column: set() for column in _UNIQUE_COLUMNS}
+        for values, future in batch:
+            duplicate = next(
+                (
+                    column for column in _UNIQUE_COLUMNS
+                    if values.get(column) is not None and values[column] in seen[column]
+                ),
+                None,
+            )
+            if duplicate is not None:
+                _resolve(future, error=DuplicateUserError(duplicate))
+                continue
+            for column in _UNIQUE_COLUMNS:
+                if values.get(column) is not None:
+                    seen[column].add(values[column])
+            rows.append((values, future))
+
+        try:
+            async with AsyncSessionLocal() as session:
+                result = await session.execute(
+                    _INSERT_QUERY,
+                    {column: [values.get(column) for values, _ in rows] for column in _COLUMNS},
+                )
+                created = {row.id_telegram: row.id for row in result}
+                conflicts = [(values, future) for values, future in rows if values["id_telegram"] not in created]
+                existing: dict[str, set] = {column: set() for column in _UNIQUE_COLUMNS}
+                if conflicts:
+                    existing = await _existing_values(session, [values for values, _ in conflicts])
+                await session.commit()
+        except Exception as e:
+            logger.error(f"Ошибка при пакетном создании {len(rows)} пользователей: {e}")
+            for _, future in rows:
+                _resolve(future, error=e)
+            return
+
+        for values, future in rows:
+            if values["id_telegram"] in created:
+                _resolve(future, result=created[values["id_telegram"]])
+            else:
+                field = next(
+                    (column for column in _UNIQUE_COLUMNS if values.get(column) in existing[column]), None
+                )
+                _resolve(future, error=DuplicateUserError(field))
+
+    async def drain(self) -> None:
+        """Сбрасывает очередь и дожидается идущих пачек (при остановке приложения)"""
+        self._flush_pending()
+        if self._flushes:
+            await asyncio.gather(*self._flushes, return_exceptions=True)
+
+
+async def _existing_values(session: AsyncSession, rows: list[dict[str, Any]]) -> dict[str, set]:
+    """Значения уникальных колонок отклоненных строк, уже занятые в таблице"""
+    values = {
+        column: [row[column] for row in rows if row.get(column) is not None] for column in _UNIQUE_COLUMNS
+    }
+    table = UserModel.__table__
+    query = select(*(table.c[column] for column in _UNIQUE_COLUMNS)).where(
+        or_(
+            *(
+                table.c[column] == any_(bindparam(column, values[column], type_=ARRAY(table.c[column].type)))
+                for column in _UNIQUE_COLUMNS
+            )
+        )
+    )
+    result = await session.execute(query)
+    existing: dict[str, set] = {column: set() for column in _UNIQUE_COLUMNS}
+    for row in result:
+        for column in _UNIQUE_COLUMNS:
+            existing[column].add(getattr(row, column))
+    return existing
+
+
+def _resolve(future: asyncio.Future, result: int | None = None, error: Exception | None = None) -> None:
+    # Вызывающий мог быть отменен (клиент отключился), пока пачка была в работе
+    if future.done():
+        return
+    if error is not None:
+        future.set_exception(error)
+    else:
+        future.set_result(result)
+
+
+user_create_batcher = (
+    UserCreateBatcher(settings.user_create_batch_max_rows, settings.user_create_batch_max_delay_ms)
+    if settings.user_create_batching
+    else None
+)
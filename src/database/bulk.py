@@ -0,0 +1,92 @@
+from dataclasses import dataclass, field
+from typing import Any
+
+from sqlalchemy import Boolean, literal_column, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .models import EmployeeModel
+
+
+@dataclass
+class BulkUpsertResult:
+    """Итог пакетной синхронизации сотрудников"""
+    created: int = 0
+    updated: int = 0
+    # Строки, совпавшие с сохраненными: не перезаписываются и не попадают в ленту изменений
+    unchanged: int = 0
+    errors: list[tuple[str, str]] = field(default_factory=list)
+    # zup_id, повторенные в пакете: записана последняя строка, предыдущие пропущены
+    skipped_duplicates: list[str] = field(default_factory=list)
+
+
+def _upsert_statement(rows: list[dict[str, Any]]):
+    """Строит INSERT ... ON CONFLICT (zup_id) DO UPDATE для пачки строк"""
+    statement = insert(EmployeeModel).values(rows)
+    updated_columns = {
+        column: statement.excluded[column]
+        for column in rows[0]
+        if column not in ("id", "zup_id")
+    }
+    table = EmployeeModel.__table__
+    # Неизмененная строка не переписывается: иначе она получила бы новый change_seq,
+    # запустила триггеры оргструктуры и сводок и попала бы в ленту изменений
+    changed = tuple_(*(table.c[column] for column in updated_columns)).is_distinct_from(
+        tuple_(*updated_columns.values())
+    )
+    # xmax = 0 только у строк, вставленных этим оператором, а не обновленных
+    return statement.on_conflict_do_update(
+        index_elements=[EmployeeModel.zup_id],
+        set_=updated_columns,
+        where=changed,
+    ).returning(literal_column("xmax = 0", Boolean))
+
+
+def _count(result: BulkUpsertResult, rows: int, inserted: list[bool]) -> None:
+    """Учитывает вставленные, обновленные и оставшиеся без изменений строки пачки"""
+    created = sum(inserted)
+    result.created += created
+    result.updated += len(inserted) - created
+    # RETURNING не возвращает строки, которые WHERE в ON CONFLICT оставил как есть
+    result.unchanged += rows - len(inserted)
+
+
+async def upsert_employees(
+    session: AsyncSession, rows: list[dict[str, Any]], chunk_size: int
+) -> BulkUpsertResult:
+    """Вставляет или обновляет сотрудников по zup_id пачками в одной транзакции
+
+    Пачка, упавшая на ограничении БД, откатывается до своей точки сохранения
+    и повторяется построчно, чтобы отсеять только проблемные строки.
+    """
+    result = BulkUpsertResult()
+
+    # В одном INSERT ... ON CONFLICT строка не может обновляться дважды, поэтому
+    # повторы zup_id внутри пакета схлопываются: побеждает последняя запись
+    unique_rows: dict[str, dict[str, Any]] = {}
+    for row in rows:
+        if row["zup_id"] in unique_rows:
+            result.skipped_duplicates.append(row["zup_id"])
+        unique_rows[row["zup_id"]] = row
+    rows = list(unique_rows.values())
+
+    for start in range(0, len(rows), chunk_size):
+        chunk = rows[start:start + chunk_size]
+        try:
+            async with session.begin_nested():
+                inserted = (await session.scalars(_upsert_statement(chunk))).all()
+        except DBAPIError:
+            for row in chunk:
+                try:
+                    async with session.begin_nested():
+                        inserted = (await session.scalars(_upsert_statement([row]))).all()
+                except DBAPIError as e:
+                    result.errors.append((row["zup_id"], str(e.orig)))
+                    continue
+                _count(result, 1, inserted)
+            continue
+        _count(result, len(chunk), inserted)
+
+    await session.commit()
+    return result
@@ -0,0 +1,128 @@
+from dataclasses import dataclass, field
+from typing import Any, Sequence
+
+from sqlalchemy import DDL, ColumnElement, event, select, text, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .models import Base, EmployeeModel, TombstoneModel, UserModel
+
+# Триггеры ведут журнал на стороне БД, поэтому в него попадают все пути записи:
+# репозиторий, пакетная синхронизация, импорт через COPY и каскадные удаления
+_TRACK_CHANGE_FUNCTION = DDL(
+    """
+    CREATE OR REPLACE FUNCTION track_change() RETURNS trigger AS $$
+    BEGIN
+        NEW.updated_at := now();
+        NEW.change_seq := nextval('change_seq');
+        NEW.change_xid := (pg_current_xact_id()::text)::bigint;
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """
+)
+_RECORD_TOMBSTONE_FUNCTION = DDL(
+    """
+    CREATE OR REPLACE FUNCTION record_tombstone() RETURNS trigger AS $$
+    BEGIN
+        INSERT INTO tombstones (entity, record_id, id_telegram) VALUES (TG_TABLE_NAME, OLD.id, OLD.id_telegram);
+        RETURN OLD;
+    END
+    $$ LANGUAGE plpgsql
+    """
+)
+event.listen(Base.metadata, "before_create", _TRACK_CHANGE_FUNCTION)
+event.listen(Base.metadata, "before_create", _RECORD_TOMBSTONE_FUNCTION)
+
+for _table in (UserModel.__table__, EmployeeModel.__table__):
+    for _trigger in (
+        f"CREATE TRIGGER {_table.name}_track_insert BEFORE INSERT ON {_table.name} "
+        "FOR EACH ROW EXECUTE FUNCTION track_change()",
+        # UPDATE без фактических изменений (повторная синхронизация) не сдвигает ленту
+        f"CREATE TRIGGER {_table.name}_track_update BEFORE UPDATE ON {_table.name} "
+        "FOR EACH ROW WHEN (OLD.* IS DISTINCT FROM NEW.*) EXECUTE FUNCTION track_change()",
+        f"CREATE TRIGGER {_table.name}_record_tombstone AFTER DELETE ON {_table.name} "
+        "FOR EACH ROW EXECUTE FUNCTION record_tombstone()",
+    ):
+        event.listen(_table, "after_create", DDL(_trigger))
+
+# Все транзакции с меньшим ID уже завершены: их изменения не появятся задним числом
+_HORIZON_QUERY = text("SELECT (pg_snapshot_xmin(pg_current_snapshot())::text)::bigint")
+
+
+@dataclass
+class ChangePage:
+    """Страница ленты изменений и позиция, с которой читать дальше"""
+    changes: list[dict[str, Any]] = field(default_factory=list)
+    position: tuple[int, int] = (0, 0)
+    has_more: bool = False
+
+
+async def fetch_changes(
+    session: AsyncSession,
+    model: type[UserModel] | type[EmployeeModel],
+    columns: Sequence[ColumnElement],
+    after: tuple[int, int],
+    limit: int,
+) -> ChangePage:
+    """Возвращает изменения и удаления строк модели после позиции (xid, seq)
+
+    Порядок — по транзакции, а внутри нее по номеру изменения. Номера
+    выдаются при записи, а не при фиксации, поэтому лента обрывается на
+    самой старой незавершенной транзакции: иначе ее изменения с меньшими
+    номерами появились бы позже и были бы пропущены потребителем.
+    """
+    horizon = (await session.execute(_HORIZON_QUERY)).scalar_one()
+
+    upserts = await session.execute(
+        select(model.change_xid, model.change_seq, model.updated_at, *columns)
+        .where(tuple_(model.change_xid, model.change_seq) > tuple_(*after), model.change_xid < horizon)
+        .order_by(model.change_xid, model.change_seq)
+        .limit(limit + 1)
+    )
+    deletes = await session.execute(
+        select(TombstoneModel)
+        .where(
+            TombstoneModel.entity == model.__tablename__,
+            tuple_(TombstoneModel.change_xid, TombstoneModel.change_seq) > tuple_(*after),
+            TombstoneModel.change_xid < horizon,
+        )
+        .order_by(TombstoneModel.change_xid, TombstoneModel.change_seq)
+        .limit(limit + 1)
+    )
+
+    changes = [
+        (
+            (row.change_xid, row.change_seq),
+            {
+                "op": "upsert",
+                "id": row.id,
+                "id_telegram": row.id_telegram,
+                "version": row.change_seq,
+                "updated_at": row.updated_at,
+                "data": {column.key: row._mapping[column.key] for column in columns},
+            },
+        )
+        for row in upserts
+    ]
+    changes.extend(
+        (
+            (tombstone.change_xid, tombstone.change_seq),
+            {
+                "op": "delete",
+                "id": tombstone.record_id,
+                "id_telegram": tombstone.id_telegram,
+                "version": tombstone.change_seq,
+                "updated_at": tombstone.deleted_at,
+                "data": None,
+            },
+        )
+        for tombstone in deletes.scalars()
+    )
+    changes.sort(key=lambda change: change[0])
+
+    page = ChangePage(has_more=len(changes) > limit, position=after)
+    changes = changes[:limit]
+    if changes:
+        page.position = changes[-1][0]
+    page.changes = [change for _, change in changes]
+    return page
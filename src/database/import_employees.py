@@ -0,0 +1,263 @@
+import argparse
+import asyncio
+import codecs
+import csv
+import json
+import logging
+from dataclasses import dataclass, field
+from enum import Enum
+from pathlib import Path
+from typing import AsyncIterator, Callable
+
+from pydantic import ValidationError
+
+from .session import engine
+from ..config import settings
+from ..schemas import EmployeeCreateSchema
+
+logger = logging.getLogger(__name__)
+
+STAGING_TABLE = "employees_import"
+COLUMNS = list(EmployeeCreateSchema.model_fields)
+
+
+class ImportFormat(str, Enum):
+    """Формат файла импорта"""
+    csv = "csv"
+    jsonl = "jsonl"
+
+
+@dataclass
+class ImportResult:
+    """Итог импорта сотрудников"""
+    processed: int = 0
+    created: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    rejected_count: int = 0
+    rejected: list[tuple[int, str]] = field(default_factory=list)
+
+    def reject(self, line: int, detail: str) -> None:
+        """Учитывает отклоненную строку, сохраняя ограниченное число подробностей"""
+        self.rejected_count += 1
+        if len(self.rejected) < settings.import_max_reported_rejects:
+            self.rejected.append((line, detail))
+
+
+async def _iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """Декодирует поток байтов в строки без символа перевода строки"""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    tail = ""
+    async for chunk in chunks:
+        lines = (tail + decoder.decode(chunk)).split("\n")
+        tail = lines.pop()
+        for line in lines:
+            yield line
+    tail += decoder.decode(b"", final=True)
+    if tail:
+        yield tail
+
+
+async def _iter_records(
+    chunks: AsyncIterator[bytes], import_format: ImportFormat
+) -> AsyncIterator[tuple[int, str]]:
+    """Собирает из потока записи вместе с номером их первой строки
+
+    Запись CSV может занимать несколько строк, если перевод строки стоит
+    внутри кавычек, поэтому она заканчивается только при четном числе кавычек.
+    """
+    record: list[str] = []
+    quotes = 0
+    line_no = 0
+    async for line in _iter_lines(chunks):
+        line_no += 1
+        record.append(line)
+        if import_format is ImportFormat.csv:
+            quotes += line.count('"')
+            if quotes % 2:
+                continue
+        yield line_no - len(record) + 1, "\n".join(record)
+        record, quotes = [], 0
+    if record:
+        yield line_no - len(record) + 1, "\n".join(record)
+
+
+async def _iter_batches(
+    chunks: AsyncIterator[bytes],
+    import_format: ImportFormat,
+    chunk_size: int,
+    result: ImportResult,
+) -> AsyncIterator[list[tuple]]:
+    """Разбирает и валидирует записи, отдавая пачки кортежей для COPY"""
+    header: list[str] | None = None
+    batch: list[tuple] = []
+
+    async for line, record in _iter_records(chunks, import_format):
+        if not record.strip():
+            continue
+        try:
+            if import_format is ImportFormat.csv:
+                values = next(csv.reader([record]))
+                if header is None:
+                    header = [name.strip() for name in values]
+                    continue
+                # Пустые ячейки опускаем, чтобы сработали значения по умолчанию схемы
+                data = {name: value for name, value in zip(header, values) if value != ""}
+            else:
+                data = json.loads(record)
+            employee = EmployeeCreateSchema.model_validate(data)
+        except (ValidationError, ValueError, csv.Error) as e:
+            result.processed += 1
+            result.reject(line, str(e))
+            continue
+
+        result.processed += 1
+        dumped = employee.model_dump()
+        batch.append((*(dumped[column] for column in COLUMNS), line))
+        if len(batch) >= chunk_size:
+            yield batch
+            batch = []
+
+    if batch:
+        yield batch
+
+
+# Строки, которые нарушили бы ограничения employees при слиянии, отсеиваются заранее
+_REJECT_QUERIES = (
+    (
+        "Duplicate zup_id in file, last entry wins",
+        f"""DELETE FROM {STAGING_TABLE} s USING {STAGING_TABLE} t
+            WHERE s.zup_id = t.zup_id AND s.source_line < t.source_line
+            RETURNING s.source_line""",
+    ),
+    (
+        "User with this id_telegram does not exist",
+        f"""DELETE FROM {STAGING_TABLE} s
+            WHERE NOT EXISTS (SELECT 1 FROM users u WHERE u.id_telegram = s.id_telegram)
+            RETURNING s.source_line""",
+    ),
+    (
+        "Duplicate login or id_telegram in file",
+        f"""DELETE FROM {STAGING_TABLE} s USING {STAGING_TABLE} t
+            WHERE (s.login = t.login OR s.id_telegram = t.id_telegram)
+              AND s.source_line < t.source_line
+            RETURNING s.source_line""",
+    ),
+    (
+        "Login or id_telegram belongs to another employee",
+        f"""DELETE FROM {STAGING_TABLE} s USING employees e
+            WHERE (e.login = s.login OR e.id_telegram = s.id_telegram)
+              AND e.zup_id <> s.zup_id
+            RETURNING s.source_line""",
+    ),
+)
+
+_UPDATED_COLUMNS = [column for column in COLUMNS if column != "zup_id"]
+
+# Совпадающие с сохраненными строки не переписываются и не попадают в ленту изменений
+_MERGE_QUERY = f"""
+    WITH merged AS (
+        INSERT INTO employees ({", ".join(COLUMNS)})
+        SELECT {", ".join(COLUMNS)} FROM {STAGING_TABLE}
+        ON CONFLICT (zup_id) DO UPDATE SET
+            {", ".join(f"{column} = EXCLUDED.{column}" for column in _UPDATED_COLUMNS)}
+        WHERE ({", ".join(f"employees.{column}" for column in _UPDATED_COLUMNS)})
+            IS DISTINCT FROM ({", ".join(f"EXCLUDED.{column}" for column in _UPDATED_COLUMNS)})
+        RETURNING xmax = 0 AS inserted
+    )
+    SELECT
+        count(*) FILTER (WHERE inserted),
+        count(*) FILTER (WHERE NOT inserted),
+        (SELECT count(*) FROM {STAGING_TABLE}) - count(*)
+    FROM merged
+"""
+
+
+async def import_employees(
+    chunks: AsyncIterator[bytes],
+    import_format: ImportFormat,
+    chunk_size: int | None = None,
+    on_progress: Callable[[ImportResult], None] | None = None,
+) -> ImportResult:
+    """Загружает сотрудников из потока CSV/JSONL через COPY во временную таблицу
+
+    Файл читается и валидируется пачками, каждая пачка уходит в БД бинарным
+    COPY, поэтому в памяти никогда не лежит больше одной пачки. После загрузки
+    строки сливаются в employees одним INSERT ... ON CONFLICT (zup_id).
+    """
+    chunk_size = chunk_size or settings.import_chunk_size
+    result = ImportResult()
+
+    async with engine.connect() as conn:
+        raw_connection = await conn.get_raw_connection()
+        driver_connection = raw_connection.driver_connection
+
+        async with driver_connection.transaction():
+            await driver_connection.execute(
+                f"CREATE TEMP TABLE {STAGING_TABLE} ON COMMIT DROP AS "
+                f"SELECT {', '.join(COLUMNS)}, 0 AS source_line FROM employees WITH NO DATA"
+            )
+
+            async for batch in _iter_batches(chunks, import_format, chunk_size, result):
+                await driver_connection.copy_records_to_table(
+                    STAGING_TABLE, records=batch, columns=[*COLUMNS, "source_line"]
+                )
+                logger.info(
+                    f"Импорт сотрудников: обработано {result.processed}, "
+                    f"отклонено {result.rejected_count}"
+                )
+                if on_progress:
+                    on_progress(result)
+
+            await driver_connection.execute(f"ANALYZE {STAGING_TABLE}")
+            for detail, query in _REJECT_QUERIES:
+                for record in await driver_connection.fetch(query):
+                    result.reject(record["source_line"], detail)
+
+            result.created, result.updated, result.unchanged = await driver_connection.fetchrow(_MERGE_QUERY)
+
+    result.rejected.sort()
+    logger.info(
+        f"Импорт сотрудников завершен: создано {result.created}, обновлено {result.updated}, "
+        f"без изменений {result.unchanged}, отклонено {result.rejected_count}"
+    )
+    return result
+
+
+async def _read_file(path: Path, size: int = 1 << 16) -> AsyncIterator[bytes]:
+    """Читает файл кусками, не блокируя цикл событий"""
+    with path.open("rb") as file:
+        while chunk := await asyncio.to_thread(file.read, size):
+            yield chunk
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Импорт сотрудников из CSV/JSONL через COPY")
+    parser.add_argument("path", type=Path, help="Путь к файлу CSV или JSONL")
+    parser.add_argument("--format", choices=[f.value for f in ImportFormat], help="Формат файла")
+    parser.add_argument("--chunk-size", type=int, default=settings.import_chunk_size)
+    args = parser.parse_args()
+
+    import_format = ImportFormat(args.format or args.path.suffix.lstrip(".").lower())
+
+    def report(progress: ImportResult) -> None:
+        print(f"Обработано: {progress.processed}, отклонено: {progress.rejected_count}")
+
+    try:
+        result = await import_employees(
+            _read_file(args.path), import_format, args.chunk_size, on_progress=report
+        )
+    finally:
+        await engine.dispose()
+
+    for line, detail in result.rejected:
+        print(f"Строка {line}: {detail}")
+    print(
+        f"Создано: {result.created}, обновлено: {result.updated}, "
+        f"без изменений: {result.unchanged}, отклонено: {result.rejected_count}"
+    )
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main())
@@ -0,0 +1,82 @@
+import logging
+import time
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from ..config import settings
+from ..core.metrics import (
+    current_request,
+    db_pool_checkout_wait,
+    db_query_duration,
+    db_slow_queries,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Пул соединений, который измеряет ожидание выдачи соединения"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.waiters = 0
+
+    def _do_get(self):
+        self.waiters += 1
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            self.waiters -= 1
+            waited = time.perf_counter() - started
+            db_pool_checkout_wait.observe(waited)
+            stats = current_request.get()
+            if stats is not None:
+                stats.pool_wait += waited
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_started"].pop()
+    db_query_duration.observe(elapsed)
+
+    stats = current_request.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.db_time += elapsed
+
+    if elapsed * 1000 >= settings.database_slow_query_ms:
+        db_slow_queries.inc()
+        # Параметры не логируются: в них персональные данные сотрудников
+        logger.warning(f"Медленный запрос ({elapsed * 1000:.1f} мс): {statement}")
+
+
+def _handle_error(exception_context):
+    # Упавший запрос не доходит до after_cursor_execute, снимаем его отметку времени
+    connection = exception_context.connection
+    if connection is not None and connection.info.get("query_started"):
+        connection.info["query_started"].pop()
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """Подключает подсчет запросов и журнал медленных запросов к движку"""
+    event.listen(engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine.sync_engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine.sync_engine, "handle_error", _handle_error)
+
+
+def pool_stats(engine: AsyncEngine) -> dict[str, int]:
+    """Текущее состояние пула соединений движка"""
+    pool = engine.pool
+    return {
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": max(pool.overflow(), 0),
+        "waiters": getattr(pool, "waiters", 0),
+    }
@@ -1,5 +1,5 @@
-from datetime import date
-from sqlalchemy import ForeignKey
+from datetime import date, datetime
+from sqlalchemy import BigInteger, DateTime, ForeignKey, Index, Sequence, func, text
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 
 
@@ -7,8 +7,29 @@ class Base(DeclarativeBase):
     pass
 
 
-class UserModel(Base):
+# Общая последовательность изменений: номер каждой вставки, изменения и удаления строки
+CHANGE_SEQ = Sequence("change_seq", metadata=Base.metadata)
+# 64-битный ID текущей транзакции (xid8 с эпохой не переполняется)
+CURRENT_XID = text("(pg_current_xact_id()::text)::bigint")
+
+
+class ChangeTrackingMixin:
+    """Колонки журнала изменений; значения проставляет триггер track_change (см. changes.py)"""
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
+    change_seq: Mapped[int] = mapped_column(
+        BigInteger, nullable=False, server_default=CHANGE_SEQ.next_value()
+    )
+    # Транзакция последнего изменения: лента отдает только завершенные транзакции
+    change_xid: Mapped[int] = mapped_column(BigInteger, nullable=False, server_default=CURRENT_XID)
+
+
+class UserModel(ChangeTrackingMixin, Base):
     __tablename__ = "users"
+    __table_args__ = (
+        Index("ix_users_change", "change_xid", "change_seq"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     id_telegram: Mapped[int] = mapped_column(nullable=False, unique=True)
@@ -20,8 +41,16 @@ class UserModel(Base):
     # Связь один-к-одному
     employee: Mapped["EmployeeModel"] = relationship(back_populates="user", uselist=False)
 
-class EmployeeModel(Base):
+class EmployeeModel(ChangeTrackingMixin, Base):
     __tablename__ = "employees"
+    __table_args__ = (
+        # Составные индексы под фильтры списка с keyset-пагинацией по id
+        Index("ix_employees_department_id", "department", "id"),
+        Index("ix_employees_organisation_id", "organisation", "id"),
+        Index("ix_employees_is_working_id", "is_working", "id"),
+        Index("ix_employees_change", "change_xid", "change_seq"),
+        Index("ix_employees_org_unit_id", "org_unit_id", "id"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     id_telegram: Mapped[int] = mapped_column(
@@ -47,6 +76,78 @@ class EmployeeModel(Base):
     phone: Mapped[str] = mapped_column(nullable=False)
     email: Mapped[str] = mapped_column(nullable=False)
     is_working: Mapped[bool] = mapped_column(nullable=False, default=True)
+    # Узел оргструктуры из full_org_structure; проставляет триггер (см. org.py)
+    org_unit_id: Mapped[int | None] = mapped_column(ForeignKey("org_units.id"), nullable=True)
 
     # Связь один-к-одному
-    user: Mapped["UserModel"] = relationship(back_populates="employee")
\ No newline at end of file
+    user: Mapped["UserModel"] = relationship(back_populates="employee")
+
+
+class OrgUnitModel(Base):
+    """Узел оргструктуры: организация, дирекция, подразделение и т.д."""
+    __tablename__ = "org_units"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    parent_id: Mapped[int | None] = mapped_column(ForeignKey("org_units.id"), nullable=True, index=True)
+    name: Mapped[str] = mapped_column(nullable=False)
+    # Полный путь от корня через " / ", как в нормализованном full_org_structure
+    path: Mapped[str] = mapped_column(nullable=False, unique=True)
+    depth: Mapped[int] = mapped_column(nullable=False)
+
+
+class OrgUnitClosureModel(Base):
+    """Таблица замыкания: все пары предок-потомок, включая узел сам с собой"""
+    __tablename__ = "org_unit_closure"
+    __table_args__ = (
+        Index("ix_org_unit_closure_descendant", "descendant_id"),
+    )
+
+    ancestor_id: Mapped[int] = mapped_column(ForeignKey("org_units.id"), primary_key=True)
+    descendant_id: Mapped[int] = mapped_column(ForeignKey("org_units.id"), primary_key=True)
+    depth: Mapped[int] = mapped_column(nullable=False)
+
+
+class HeadcountSummaryModel(Base):
+    """Численность сотрудников по организации, подразделению, должности и статусу
+
+    Ведется триггерами на employees (см. analytics.py), строк — не больше
+    числа сочетаний измерений, а не числа сотрудников.
+    """
+    __tablename__ = "headcount_summary"
+
+    organisation: Mapped[str] = mapped_column(primary_key=True)
+    department: Mapped[str] = mapped_column(primary_key=True)
+    position: Mapped[str] = mapped_column(primary_key=True)
+    is_working: Mapped[bool] = mapped_column(primary_key=True)
+    # Уволен: указана дата окончания работы
+    terminated: Mapped[bool] = mapped_column(primary_key=True)
+    employees: Mapped[int] = mapped_column(nullable=False)
+
+
+class HireSummaryModel(Base):
+    """Число принятых сотрудников по месяцу начала работы"""
+    __tablename__ = "hire_summary"
+
+    organisation: Mapped[str] = mapped_column(primary_key=True)
+    department: Mapped[str] = mapped_column(primary_key=True)
+    hire_month: Mapped[date] = mapped_column(primary_key=True)
+    hires: Mapped[int] = mapped_column(nullable=False)
+
+
+class TombstoneModel(Base):
+    """След удаленной строки для ленты изменений"""
+    __tablename__ = "tombstones"
+    __table_args__ = (
+        Index("ix_tombstones_entity_change", "entity", "change_xid", "change_seq"),
+    )
+
+    change_seq: Mapped[int] = mapped_column(
+        BigInteger, primary_key=True, server_default=CHANGE_SEQ.next_value()
+    )
+    change_xid: Mapped[int] = mapped_column(BigInteger, nullable=False, server_default=CURRENT_XID)
+    entity: Mapped[str] = mapped_column(nullable=False)
+    record_id: Mapped[int] = mapped_column(nullable=False)
+    id_telegram: Mapped[int] = mapped_column(nullable=False)
+    deleted_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
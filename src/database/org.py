@@ -0,0 +1,69 @@
+from sqlalchemy import DDL, event
+
+from .models import Base, EmployeeModel
+
+# Узлы и замыкание строятся в БД, поэтому иерархия актуальна при любом пути записи:
+# создание, PATCH, /employees/bulk и импорт. Уже известный путь — один поиск по индексу.
+_ENSURE_ORG_UNIT_FUNCTION = DDL(
+    """
+    CREATE OR REPLACE FUNCTION ensure_org_unit(structure text) RETURNS bigint AS $$
+    DECLARE
+        parts text[];
+        unit_path text;
+        unit_id bigint;
+        parent bigint;
+    BEGIN
+        SELECT array_agg(btrim(part) ORDER BY n) INTO parts
+        FROM unnest(string_to_array(structure, '/')) WITH ORDINALITY AS t(part, n)
+        WHERE btrim(part) <> '';
+        IF parts IS NULL THEN
+            RETURN NULL;
+        END IF;
+
+        SELECT id INTO unit_id FROM org_units WHERE path = array_to_string(parts, ' / ');
+        IF FOUND THEN
+            RETURN unit_id;
+        END IF;
+
+        FOR i IN 1 .. array_length(parts, 1) LOOP
+            unit_path := array_to_string(parts[1:i], ' / ');
+            INSERT INTO org_units (parent_id, name, path, depth) VALUES (parent, parts[i], unit_path, i - 1)
+            ON CONFLICT (path) DO NOTHING
+            RETURNING id INTO unit_id;
+            IF unit_id IS NULL THEN
+                SELECT id INTO unit_id FROM org_units WHERE path = unit_path;
+            ELSE
+                INSERT INTO org_unit_closure (ancestor_id, descendant_id, depth)
+                SELECT ancestor_id, unit_id, depth + 1 FROM org_unit_closure WHERE descendant_id = parent
+                UNION ALL
+                SELECT unit_id, unit_id, 0;
+            END IF;
+            parent := unit_id;
+        END LOOP;
+        RETURN unit_id;
+    END
+    $$ LANGUAGE plpgsql
+    """
+)
+_ASSIGN_ORG_UNIT_FUNCTION = DDL(
+    """
+    CREATE OR REPLACE FUNCTION assign_org_unit() RETURNS trigger AS $$
+    BEGIN
+        NEW.org_unit_id := ensure_org_unit(NEW.full_org_structure);
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """
+)
+event.listen(Base.metadata, "before_create", _ENSURE_ORG_UNIT_FUNCTION)
+event.listen(Base.metadata, "before_create", _ASSIGN_ORG_UNIT_FUNCTION)
+
+# Имена идут раньше employees_track_* по алфавиту: узел проставляется до учета изменения
+for _trigger in (
+    "CREATE TRIGGER employees_org_unit_insert BEFORE INSERT ON employees "
+    "FOR EACH ROW EXECUTE FUNCTION assign_org_unit()",
+    "CREATE TRIGGER employees_org_unit_update BEFORE UPDATE ON employees "
+    "FOR EACH ROW WHEN (OLD.full_org_structure IS DISTINCT FROM NEW.full_org_structure) "
+    "EXECUTE FUNCTION assign_org_unit()",
+):
+    event.listen(EmployeeModel.__table__, "after_create", DDL(_trigger))
@@ -0,0 +1,113 @@
+import asyncio
+import logging
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.orm import Session
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+# Отставание реплики; при полностью примененном WAL — 0, даже если записей давно не было
+_LAG_QUERY = text(
+    """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+    """
+)
+
+
+@dataclass
+class RoutingState:
+    """Маршрутизация чтений в рамках одного HTTP-запроса"""
+    pinned: bool = False
+    committed: bool = False
+
+
+current_routing: ContextVar[RoutingState | None] = ContextVar("current_routing", default=None)
+
+
+def reads_pinned_to_primary() -> bool:
+    """Должен ли текущий запрос читать с основной БД (клиент недавно писал)"""
+    state = current_routing.get()
+    return state is not None and state.pinned
+
+
+def mark_committed() -> None:
+    """Отмечает, что текущий запрос зафиксировал запись"""
+    state = current_routing.get()
+    if state is not None:
+        state.committed = True
+
+
+@event.listens_for(Session, "after_commit")
+def _mark_committed(session: Session) -> None:
+    mark_committed()
+
+
+class ReplicaRouter:
+    """Раздает движки реплик по кругу, пропуская отставшие и недоступные"""
+
+    def __init__(self, engines: list[AsyncEngine]):
+        self.engines = engines
+        # До первой проверки реплика не обслуживает чтения: она может отставать или быть недоступна
+        self.healthy = [False] * len(engines)
+        self._next = 0
+        self._task: asyncio.Task | None = None
+
+    def pick(self) -> AsyncEngine | None:
+        """Следующая здоровая реплика или None, если читать нужно с основной БД"""
+        for _ in range(len(self.engines)):
+            index = self._next % len(self.engines)
+            self._next += 1
+            if self.healthy[index]:
+                return self.engines[index]
+        return None
+
+    async def check(self) -> None:
+        """Проверяет доступность и отставание каждой реплики"""
+        for index, replica in enumerate(self.engines):
+            try:
+                async with asyncio.timeout(settings.replica_health_timeout_seconds):
+                    async with replica.connect() as conn:
+                        lag = float((await conn.execute(_LAG_QUERY)).scalar_one())
+                healthy = lag <= settings.replica_max_lag_seconds
+                reason = f"отставание {lag:.1f} с"
+            except Exception as e:
+                healthy = False
+                reason = str(e) or type(e).__name__
+            if healthy != self.healthy[index]:
+                state = "доступна" if healthy else "исключена из чтения"
+                logger.warning(f"Реплика {replica.url.host}:{replica.url.port} {state}: {reason}")
+            self.healthy[index] = healthy
+
+    async def _run(self) -> None:
+        while True:
+            await self.check()
+            await asyncio.sleep(settings.replica_health_interval_seconds)
+
+    def start(self) -> None:
+        """Запускает фоновые проверки здоровья реплик"""
+        if self.engines and self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Останавливает проверки и закрывает пулы реплик"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for replica in self.engines:
+            await replica.dispose()
+
+    def stats(self) -> dict[str, int]:
+        """Число настроенных и здоровых реплик"""
+        return {"total": len(self.engines), "healthy": sum(self.healthy)}
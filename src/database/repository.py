@@ -0,0 +1,76 @@
+from typing import Any, Generic, Sequence, TypeVar
+
+from sqlalchemy import ColumnElement, RowMapping, any_, bindparam, delete, insert, select, update
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
+
+from .models import Base, EmployeeModel, UserModel
+
+ModelT = TypeVar("ModelT", bound=Base)
+
+
+def any_of(column: InstrumentedAttribute, values: list[Any]) -> ColumnElement[bool]:
+    """Условие column = ANY($1) с массивом значений в одном параметре"""
+    # Текст запроса не зависит от размера пакета и переиспользует подготовленный оператор
+    return column == any_(bindparam("values", values, type_=ARRAY(column.type)))
+
+
+class Repository(Generic[ModelT]):
+    """Доступ к таблице модели одиночными операторами с RETURNING
+
+    Каждая операция — один запрос к БД без загрузки ORM-объекта в сессию.
+    Фиксацию транзакции выполняет вызывающий код.
+    """
+
+    def __init__(self, model: type[ModelT]):
+        self.model = model
+        self.table = model.__table__
+
+    async def get(
+        self,
+        session: AsyncSession,
+        where: ColumnElement[bool],
+        columns: Sequence[ColumnElement] | None = None,
+    ) -> RowMapping | None:
+        """Возвращает строку по условию или None"""
+        query = select(*columns) if columns is not None else select(self.table)
+        result = await session.execute(query.where(where))
+        return result.mappings().one_or_none()
+
+    async def get_many(
+        self,
+        session: AsyncSession,
+        column: InstrumentedAttribute,
+        values: list[Any],
+        columns: Sequence[ColumnElement] | None = None,
+    ) -> list[RowMapping]:
+        """Возвращает строки по списку значений колонки одним запросом column = ANY($1)"""
+        query = select(*columns) if columns is not None else select(self.table)
+        result = await session.execute(query.where(any_of(column, values)))
+        return list(result.mappings())
+
+    async def create(self, session: AsyncSession, values: dict[str, Any]) -> int:
+        """Вставляет строку и возвращает ее id"""
+        result = await session.execute(insert(self.table).values(values).returning(self.table.c.id))
+        return result.scalar_one()
+
+    async def update(
+        self, session: AsyncSession, where: ColumnElement[bool], values: dict[str, Any]
+    ) -> RowMapping | None:
+        """Обновляет строку по условию и возвращает ее новое состояние или None"""
+        if not values:
+            return await self.get(session, where)
+        result = await session.execute(
+            update(self.table).where(where).values(values).returning(*self.table.c)
+        )
+        return result.mappings().one_or_none()
+
+    async def delete(self, session: AsyncSession, where: ColumnElement[bool]) -> RowMapping | None:
+        """Удаляет строку по условию и возвращает ее последнее состояние или None"""
+        result = await session.execute(delete(self.table).where(where).returning(*self.table.c))
+        return result.mappings().one_or_none()
+
+
+users_repository = Repository(UserModel)
+employees_repository = Repository(EmployeeModel)
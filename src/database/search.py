@@ -0,0 +1,43 @@
+from typing import Sequence
+
+from sqlalchemy import DDL, ColumnElement, Float, Select, String, bindparam, event, literal_column, select, tuple_
+
+from .models import Base, EmployeeModel
+
+# Текст выражения совпадает с индексом буква в букву, иначе планировщик его не использует
+SEARCH_DOCUMENT_SQL = "lower(full_name || ' ' || login || ' ' || position || ' ' || department)"
+SEARCH_INDEX = "ix_employees_search_trgm"
+
+event.listen(Base.metadata, "before_create", DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+# GiST, а не GIN: GiST отдает строки сразу в порядке близости (KNN), и LIMIT
+# ограничивает работу запроса даже при тысячах совпадений
+event.listen(
+    EmployeeModel.__table__,
+    "after_create",
+    DDL(f"CREATE INDEX {SEARCH_INDEX} ON employees USING gist (({SEARCH_DOCUMENT_SQL}) gist_trgm_ops)"),
+)
+
+_document = literal_column(SEARCH_DOCUMENT_SQL, String)
+
+
+def search_employees_query(
+    columns: Sequence[ColumnElement], q: str, limit: int, after: tuple[float, int] | None = None
+) -> Select:
+    """Запрос поиска сотрудников по ФИО, логину, должности и подразделению
+
+    Совпадение — по сходству слов из pg_trgm (оператор <%, порог
+    pg_trgm.word_similarity_threshold), поэтому находятся части слов и опечатки.
+    Строки упорядочены по расстоянию до запроса, затем по id; расстояние
+    возвращается последней колонкой distance для курсора следующей страницы.
+    """
+    term = bindparam("q", q.lower(), type_=String)
+    distance = term.op("<<->", return_type=Float)(_document)
+    query = (
+        select(*columns, distance.label("distance"))
+        .where(term.op("<%", is_comparison=True)(_document))
+        .order_by(distance, EmployeeModel.id)
+        .limit(limit + 1)
+    )
+    if after is not None:
+        query = query.where(tuple_(distance, EmployeeModel.id) > tuple_(*after))
+    return query
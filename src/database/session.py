@@ -1,15 +1,26 @@
 from typing import AsyncGenerator
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 
 from ..config import settings
+from .instrumentation import InstrumentedQueuePool, instrument_engine
+from .replicas import ReplicaRouter, reads_pinned_to_primary
 
-engine = create_async_engine(
-    settings.database_url,
-    echo=settings.database_echo,
-    pool_pre_ping=True,
-    pool_size=10,
-    max_overflow=20,
-)
+
+def _create_engine(url: str) -> AsyncEngine:
+    new_engine = create_async_engine(
+        url,
+        echo=settings.database_echo,
+        poolclass=InstrumentedQueuePool,
+        pool_pre_ping=True,
+        pool_size=settings.pool_size,
+        max_overflow=settings.pool_max_overflow,
+    )
+    instrument_engine(new_engine)
+    return new_engine
+
+
+engine = _create_engine(settings.database_url)
+replica_router = ReplicaRouter([_create_engine(url) for url in settings.database_replica_urls])
 
 AsyncSessionLocal = async_sessionmaker(
     bind=engine,
@@ -18,6 +29,17 @@ AsyncSessionLocal = async_sessionmaker(
 )
 
 
+def read_session() -> AsyncSession:
+    """Сессия только для чтения: реплика, если запрос не закреплен за основной БД"""
+    replica = None if reads_pinned_to_primary() else replica_router.pick()
+    return AsyncSessionLocal(bind=replica) if replica is not None else AsyncSessionLocal()
+
+
 async def get_session() -> AsyncGenerator[AsyncSession, None]:
     async with AsyncSessionLocal() as session:
-        yield session
\ No newline at end of file
+        yield session
+
+
+async def get_read_session() -> AsyncGenerator[AsyncSession, None]:
+    async with read_session() as session:
+        yield session
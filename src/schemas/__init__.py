@@ -1,5 +1,17 @@
 from .user import UserCreateSchema, UserSchema, UserUpdateSchema
-from .employee import EmployeeCreateSchema, EmployeeSchema, EmployeeUpdateSchema
+from .employee import (
+    EmployeeBulkErrorSchema,
+    EmployeeBulkResultSchema,
+    EmployeeCreateSchema,
+    EmployeeSchema,
+    EmployeeUpdateSchema,
+)
+from .pagination import PageSchema
+from .batch import TelegramBatchSchema
+from .changes import ChangeSchema, ChangesPageSchema
+from .profile import ProfileSchema
+from .org import OrgUnitSchema
+from .analytics import HeadcountSchema, HiresSchema
 
 __all__ = [
     "UserCreateSchema",
@@ -8,4 +20,14 @@ __all__ = [
     "EmployeeCreateSchema",
     "EmployeeSchema",
     "EmployeeUpdateSchema",
-]
\ No newline at end of file
+    "EmployeeBulkErrorSchema",
+    "EmployeeBulkResultSchema",
+    "PageSchema",
+    "TelegramBatchSchema",
+    "ChangeSchema",
+    "ChangesPageSchema",
+    "ProfileSchema",
+    "OrgUnitSchema",
+    "HeadcountSchema",
+    "HiresSchema",
+]
@@ -0,0 +1,19 @@
+from datetime import date
+
+from pydantic import BaseModel, Field
+
+
+class HeadcountSchema(BaseModel):
+    """Схема численности группы; незапрошенные измерения равны None"""
+    organisation: str | None = Field(default=None, title="Organisation")
+    department: str | None = Field(default=None, title="Department")
+    position: str | None = Field(default=None, title="Position")
+    total: int = Field(title="Total")
+    working: int = Field(title="Working")
+    terminated: int = Field(title="Terminated")
+
+
+class HiresSchema(BaseModel):
+    """Схема числа принятых сотрудников за месяц"""
+    month: date = Field(title="Month")
+    hires: int = Field(title="Hires")
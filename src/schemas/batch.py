@@ -0,0 +1,11 @@
+from typing import Generic, TypeVar
+
+from pydantic import BaseModel, Field
+
+ItemT = TypeVar("ItemT")
+
+
+class TelegramBatchSchema(BaseModel, Generic[ItemT]):
+    """Схема результата пакетного поиска по Telegram ID"""
+    found: dict[int, ItemT] = Field(title="Found")
+    missing: list[int] = Field(title="Missing")
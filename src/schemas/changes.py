@@ -0,0 +1,23 @@
+from datetime import datetime
+from typing import Generic, Literal, TypeVar
+
+from pydantic import BaseModel, Field
+
+ItemT = TypeVar("ItemT")
+
+
+class ChangeSchema(BaseModel, Generic[ItemT]):
+    """Схема одного изменения: новое состояние строки или ее удаление"""
+    op: Literal["upsert", "delete"] = Field(title="Operation")
+    id: int = Field(title="ID")
+    id_telegram: int = Field(title="Telegram ID")
+    version: int = Field(title="Version")
+    updated_at: datetime = Field(title="Updated At")
+    data: ItemT | None = Field(default=None, title="Data")
+
+
+class ChangesPageSchema(BaseModel, Generic[ItemT]):
+    """Схема страницы ленты изменений с курсором для следующего опроса"""
+    changes: list[ChangeSchema[ItemT]] = Field(title="Changes")
+    next_cursor: str = Field(title="Next Cursor")
+    has_more: bool = Field(title="Has More")
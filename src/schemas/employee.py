@@ -56,4 +56,20 @@ class EmployeeUpdateSchema(BaseModel):
     date_of_end: date | None = Field(default=None, title="Date of End")
     phone: str | None = Field(default=None, title="Phone", min_length=7, max_length=15)
     email: EmailStr | None = Field(default=None, title="Email")
-    is_working: bool | None = Field(default=None, title="Is Working")
\ No newline at end of file
+    is_working: bool | None = Field(default=None, title="Is Working")
+
+
+class EmployeeBulkErrorSchema(BaseModel):
+    """Схема ошибки отдельной строки пакетной синхронизации"""
+    zup_id: str = Field(title="ZUP ID")
+    detail: str = Field(title="Detail")
+
+
+class EmployeeBulkResultSchema(BaseModel):
+    """Схема результата пакетной синхронизации сотрудников"""
+    created: int = Field(title="Created")
+    updated: int = Field(title="Updated")
+    unchanged: int = Field(default=0, title="Unchanged")
+    failed: int = Field(title="Failed")
+    errors: list[EmployeeBulkErrorSchema] = Field(default_factory=list, title="Errors")
+    skipped_duplicates: list[str] = Field(default_factory=list, title="Skipped Duplicates")
@@ -0,0 +1,12 @@
+from pydantic import BaseModel, Field
+
+
+class OrgUnitSchema(BaseModel):
+    """Схема узла оргструктуры с численностью его поддерева"""
+    id: int
+    parent_id: int | None = Field(default=None, title="Parent ID")
+    name: str = Field(title="Name")
+    path: str = Field(title="Path")
+    depth: int = Field(title="Depth")
+    headcount: int = Field(title="Headcount")
+    working: int = Field(title="Working")
@@ -0,0 +1,11 @@
+from typing import Generic, TypeVar
+
+from pydantic import BaseModel, Field
+
+ItemT = TypeVar("ItemT")
+
+
+class PageSchema(BaseModel, Generic[ItemT]):
+    """Схема страницы списка с курсором на следующую страницу"""
+    items: list[ItemT] = Field(title="Items")
+    next_cursor: str | None = Field(default=None, title="Next Cursor")
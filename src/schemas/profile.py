@@ -0,0 +1,10 @@
+from pydantic import BaseModel, Field
+
+from .employee import EmployeeSchema
+from .user import UserSchema
+
+
+class ProfileSchema(BaseModel):
+    """Схема профиля: пользователь вместе с карточкой сотрудника"""
+    user: UserSchema = Field(title="User")
+    employee: EmployeeSchema | None = Field(default=None, title="Employee")
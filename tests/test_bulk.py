@@ -0,0 +1,57 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+from sqlalchemy.dialects import postgresql
+
+from src.database.bulk import _upsert_statement, upsert_employees
+
+
+class FakeSession:
+    """Сессия, возвращающая заранее заданные результаты RETURNING по пачкам"""
+
+    def __init__(self, returned: list[list[bool]]):
+        self.returned = returned
+        self.statements = []
+
+    @asynccontextmanager
+    async def begin_nested(self):
+        yield
+
+    async def scalars(self, statement):
+        self.statements.append(statement)
+        returned = self.returned.pop(0)
+
+        class Result:
+            def all(self):
+                return returned
+
+        return Result()
+
+    async def commit(self):
+        pass
+
+
+def _row(zup_id: str, login: str) -> dict:
+    return {"zup_id": zup_id, "login": login, "is_working": True}
+
+
+def test_upsert_skips_unchanged_rows():
+    statement = _upsert_statement([_row("ZUP-1", "ivanov")])
+    sql = str(statement.compile(dialect=postgresql.dialect()))
+    assert (
+        "WHERE (employees.login, employees.is_working) IS DISTINCT FROM (excluded.login, excluded.is_working)"
+        in sql
+    )
+
+
+def test_duplicates_are_not_failures():
+    # Из трех уникальных строк одна вставлена, одна обновлена, одна не изменилась
+    session = FakeSession([[True, False]])
+    rows = [_row("ZUP-1", "old"), _row("ZUP-2", "petrov"), _row("ZUP-1", "ivanov"), _row("ZUP-3", "sidorov")]
+    result = asyncio.run(upsert_employees(session, rows, chunk_size=100))
+
+    assert result.errors == []
+    assert result.skipped_duplicates == ["ZUP-1"]
+    assert (result.created, result.updated, result.unchanged) == (1, 1, 1)
+    # Записана последняя строка повторенного zup_id
+    assert session.statements[0].compile().params["login_m0"] == "ivanov"
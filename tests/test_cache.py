@@ -0,0 +1,89 @@
+import asyncio
+import time
+
+from src.core.cache import LookupCache
+
+
+class MemoryBackend:
+    """Общий бэкенд в памяти вместо Redis"""
+
+    def __init__(self):
+        self.entries: dict[str, tuple[float, bytes]] = {}
+
+    async def get(self, key: str) -> bytes | None:
+        entry = self.entries.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            return None
+        return entry[1]
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        self.entries[key] = (time.monotonic() + ttl, value)
+
+    async def delete(self, *keys: str) -> None:
+        for key in keys:
+            self.entries.pop(key, None)
+
+    async def delete_prefix(self, prefix: str) -> None:
+        for key in [key for key in self.entries if key.startswith(prefix)]:
+            del self.entries[key]
+
+
+def _worker_cache(backend: MemoryBackend | None) -> LookupCache:
+    return LookupCache(max_size=100, ttl=60, negative_ttl=5, backend=backend)
+
+
+def test_invalidation_is_seen_by_other_worker():
+    async def scenario():
+        backend = MemoryBackend()
+        first, second = _worker_cache(backend), _worker_cache(backend)
+        record = {"version": 1, "data": {"first_name": "Иван"}}
+
+        async def load():
+            return dict(record)
+
+        assert (await first.get_or_load("user:telegram:1", load))["version"] == 1
+        assert (await second.get_or_load("user:telegram:1", load))["version"] == 1
+
+        # Запись изменена через первый воркер: второй должен сразу увидеть новую версию
+        record["version"] = 2
+        await first.invalidate("user:telegram:1")
+        assert (await second.get_or_load("user:telegram:1", load))["version"] == 2
+
+    asyncio.run(scenario())
+
+
+def test_prefix_invalidation_is_seen_by_other_worker():
+    async def scenario():
+        backend = MemoryBackend()
+        first, second = _worker_cache(backend), _worker_cache(backend)
+        version = 1
+
+        async def load():
+            return {"version": version}
+
+        await second.get_or_load("employee:telegram:1", load)
+        version = 2
+        await first.invalidate_prefix("employee:")
+        assert (await second.get_or_load("employee:telegram:1", load))["version"] == 2
+
+    asyncio.run(scenario())
+
+
+def test_local_lru_without_backend():
+    async def scenario():
+        cache = _worker_cache(None)
+        loads = 0
+
+        async def load():
+            nonlocal loads
+            loads += 1
+            return {"version": loads}
+
+        await cache.get_or_load("user:telegram:1", load)
+        await cache.get_or_load("user:telegram:1", load)
+        assert loads == 1 and cache.hits == 1
+
+        await cache.invalidate("user:telegram:1")
+        assert (await cache.get_or_load("user:telegram:1", load))["version"] == 2
+
+    asyncio.run(scenario())
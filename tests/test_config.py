@@ -0,0 +1,40 @@
+import pytest
+from pydantic import ValidationError
+
+from src.config import Settings
+
+
+def _settings(**values) -> Settings:
+    return Settings(_env_file=None, environment="production", **values)
+
+
+@pytest.mark.parametrize("workers", [1, 2, 4, 8, 15])
+def test_pools_fit_connection_budget(workers):
+    settings = _settings(workers=workers, database_max_connections=30)
+    assert settings.worker_count * (settings.pool_size + settings.pool_max_overflow) <= 30
+
+
+@pytest.mark.parametrize("workers", [1, 2, 4, 8, 15])
+def test_admission_fits_worker_pool(workers):
+    settings = _settings(workers=workers, database_max_connections=30)
+    connections = settings.pool_size + settings.pool_max_overflow
+    assert settings.read_admission_limit >= 1
+    assert settings.write_admission_limit >= 1
+    assert settings.read_admission_limit + settings.write_admission_limit <= connections
+
+
+def test_admission_overrides_are_capped_by_pool():
+    settings = _settings(workers=1, database_max_connections=10, admission_reads=50, admission_writes=50)
+    assert settings.write_admission_limit == 9
+    assert settings.read_admission_limit == 1
+
+
+def test_too_many_workers_for_budget():
+    with pytest.raises(ValidationError):
+        _settings(workers=16, database_max_connections=30)
+
+
+def test_read_admission_uses_replica_pools():
+    replicas = ["postgresql+asyncpg://replica-1/crud_service", "postgresql+asyncpg://replica-2/crud_service"]
+    settings = _settings(workers=2, database_max_connections=30, database_replica_urls=replicas)
+    assert settings.read_admission_limit == 2 * (settings.pool_size + settings.pool_max_overflow)
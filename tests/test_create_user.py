@@ -0,0 +1,76 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.exc import IntegrityError
+
+from src.api.routes import users
+from src.database import DuplicateUserError
+from src.schemas import UserCreateSchema
+
+USER = UserCreateSchema(id_telegram=1001, username="ivanov", first_name="Иван")
+
+
+class FakeSession:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    async def commit(self):
+        pass
+
+
+class FakeBatcher:
+    async def create(self, values):
+        raise DuplicateUserError("id_telegram")
+
+
+def _unique_violation(constraint_name: str) -> IntegrityError:
+    """IntegrityError в том виде, в каком его поднимает драйвер asyncpg"""
+    cause = Exception("duplicate key value violates unique constraint")
+    cause.constraint_name = constraint_name
+    orig = Exception(str(cause))
+    orig.sqlstate = "23505"
+    orig.__cause__ = cause
+    return IntegrityError("INSERT INTO users ...", {}, orig)
+
+
+def _create() -> HTTPException:
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(users.create_user(USER))
+    return error.value
+
+
+def test_duplicate_returns_409_with_batching(monkeypatch):
+    monkeypatch.setattr(users, "user_create_batcher", FakeBatcher())
+    error = _create()
+    assert error.status_code == 409
+    assert "id_telegram" in error.detail
+
+
+@pytest.mark.parametrize("field", ["id_telegram", "username"])
+def test_duplicate_returns_409_without_batching(monkeypatch, field):
+    async def create(session, values):
+        raise _unique_violation(f"users_{field}_key")
+
+    monkeypatch.setattr(users, "user_create_batcher", None)
+    monkeypatch.setattr(users, "AsyncSessionLocal", FakeSession)
+    monkeypatch.setattr(users.users_repository, "create", create)
+    error = _create()
+    assert error.status_code == 409
+    assert error.detail == f"User with this {field} already exists"
+
+
+def test_other_integrity_errors_are_not_masked(monkeypatch):
+    async def create(session, values):
+        orig = Exception("null value in column")
+        orig.sqlstate = "23502"
+        raise IntegrityError("INSERT INTO users ...", {}, orig)
+
+    monkeypatch.setattr(users, "user_create_batcher", None)
+    monkeypatch.setattr(users, "AsyncSessionLocal", FakeSession)
+    monkeypatch.setattr(users.users_repository, "create", create)
+    with pytest.raises(IntegrityError):
+        asyncio.run(users.create_user(USER))
@@ -0,0 +1,27 @@
+import pytest
+from fastapi import HTTPException
+
+from src.api.pagination import BIGINT_MAX, BIGINT_MIN, decode_cursor, encode_cursor
+
+
+def test_round_trip():
+    cursor = encode_cursor(distance=0.25, id=42)
+    assert decode_cursor(cursor, distance=float, id=int) == {"distance": 0.25, "id": 42}
+
+
+@pytest.mark.parametrize("value", [BIGINT_MIN, BIGINT_MAX])
+def test_bigint_bounds_are_accepted(value):
+    assert decode_cursor(encode_cursor(id=value), id=int)["id"] == value
+
+
+@pytest.mark.parametrize("value", [BIGINT_MAX + 1, BIGINT_MIN - 1, 10**30, True, "1", None])
+def test_invalid_id_returns_400(value):
+    with pytest.raises(HTTPException) as error:
+        decode_cursor(encode_cursor(id=value), id=int)
+    assert error.value.status_code == 400
+
+
+def test_garbage_returns_400():
+    with pytest.raises(HTTPException) as error:
+        decode_cursor("not a cursor!", id=int)
+    assert error.value.status_code == 400
@@ -0,0 +1,16 @@
+import asyncio
+
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from src.database.replicas import ReplicaRouter
+
+
+def test_replicas_serve_reads_only_after_health_check():
+    replica = create_async_engine("postgresql+asyncpg://postgres@127.0.0.1:1/crud_service")
+    router = ReplicaRouter([replica])
+    assert router.pick() is None
+
+    # Недоступная реплика остается исключенной и после проверки
+    asyncio.run(router.check())
+    assert router.pick() is None
+    assert router.stats() == {"total": 1, "healthy": 0}